@@ -1,4 +1,6 @@
 import sys
+import os
+import selectors
 import threading
 import time
 import logging
@@ -12,6 +14,81 @@ from . import event_publisher, AppEventType # Import the global event publisher
 from .server_manager import ServerManager
 from .tray_manager import TrayManager
 
+class _SelectableEvent(threading.Event):
+    """
+    A threading.Event that also keeps a byte in a pipe while set, so it can be waited on with `selectors`
+    alongside a process handle (see _block_until_exit_or_shutdown).
+    Only used where os.pidfd_open exists (Linux); the pipe is opened on the first fileno() call.
+    """
+    def __init__(self):
+        super().__init__()
+        self._pipe_lock = threading.Lock() # Guards opening the pipe against a concurrent set()/clear()
+        self._read_fd: Optional[int] = None
+        self._write_fd: Optional[int] = None
+
+    def fileno(self) -> int:
+        with self._pipe_lock:
+            if self._read_fd is None:
+                self._read_fd, self._write_fd = os.pipe()
+                os.set_blocking(self._read_fd, False)
+                os.set_blocking(self._write_fd, False)
+                if self.is_set(): # Set before anyone selected on it; the pipe must still read as ready
+                    self._write_wakeup()
+            return self._read_fd
+
+    def _write_wakeup(self):
+        try:
+            os.write(self._write_fd, b"\0")
+        except BlockingIOError: # Pipe already full of wakeups; it is readable either way
+            pass
+
+    def set(self):
+        super().set()
+        with self._pipe_lock:
+            if self._write_fd is not None:
+                self._write_wakeup()
+
+    def clear(self):
+        super().clear()
+        with self._pipe_lock:
+            if self._read_fd is None:
+                return
+            try:
+                while os.read(self._read_fd, 4096): pass
+            except BlockingIOError:
+                pass
+
+def _block_until_exit_or_shutdown(process, shutdown_event: threading.Event) -> bool:
+    """
+    Sleeps until `process` exits or `shutdown_event` is set, with no periodic wakeups, using a pidfd (Linux 5.3+).
+    Returns False without waiting when that is not possible here, so the caller keeps polling instead.
+    """
+    if not hasattr(os, "pidfd_open") or not isinstance(shutdown_event, _SelectableEvent):
+        return False
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except OSError: # Kernel without pidfd support, or the process is already reaped
+        return False
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(pidfd, selectors.EVENT_READ)
+            selector.register(shutdown_event, selectors.EVENT_READ)
+            selector.select()
+    finally:
+        os.close(pidfd)
+    return True
+
+def _report_server_exit(app_logger: logging.Logger, server_process, shutdown_event: threading.Event):
+    """
+    Watcher thread body for platforms without a pidfd: blocks in Popen.wait() (waitpid / WaitForSingleObject)
+    and reports an exit that was not part of a shutdown, as the monitor loop does.
+    """
+    returncode = server_process.wait()
+    app_logger.info(f"ComfyUI server process (PID: {server_process.pid}) has exited with code {returncode}.")
+    if not shutdown_event.is_set():
+        event_publisher.publish(AppEventType.SERVER_STOPPED_UNEXPECTEDLY, pid=server_process.pid, returncode=returncode)
+        shutdown_event.set()
+
 # Define logger and other global instances, initialized in main()
 launcher_logger: logging.Logger = None # type: ignore
 gui_manager_instance: Optional[GUIManager] = None
@@ -21,9 +98,17 @@ tray_manager_instance: Optional[TrayManager] = None
 app_logic_thread_instance: Optional[threading.Thread] = None
 
 # Global event to signal application-wide shutdown
-app_shutdown_event = threading.Event() # Main shutdown signal
+# Main shutdown signal. Where a pidfd is available it is selectable, so the server monitor can block on it; elsewhere
+# (Windows, macOS) it is a plain Event, and nothing ever registers it with a selector.
+app_shutdown_event = _SelectableEvent() if hasattr(os, "pidfd_open") else threading.Event()
 _app_logic_completed_event = threading.Event() # For main to wait for app_logic_thread
 _tray_manager_completed_event = threading.Event() # For main to wait for tray_manager_thread
+_gui_content_loaded_event = threading.Event() # Set when the GUI's initial content has loaded; app logic waits on it
+
+# Readiness probe pacing in the monitor loop: starts short so a quick server is picked up almost immediately,
+# then doubles up to the cap so a slow one is not probed needlessly often
+SERVER_READY_PROBE_INITIAL_INTERVAL = 0.1 # seconds
+SERVER_READY_PROBE_MAX_INTERVAL = 1.0 # seconds
 
 
 if TYPE_CHECKING:
@@ -69,8 +154,9 @@ def _handle_tray_manager_shutdown_complete():
     _tray_manager_completed_event.set()
 
 def custom_excepthook(exc_type, exc_value, exc_traceback):
-    global launcher_logger # Use the global logger from this module
-    if launcher_logger and launcher_logger.handlers:
+    # Installed by main() right after the logger is built. After main()'s finally block, LogManager.shutdown() has
+    # attached the console and file handlers to the logger directly, so the logger can still write from then on.
+    if launcher_logger is not None:
         launcher_logger.critical(
             "Unhandled exception caught by custom excepthook:",
             exc_info=(exc_type, exc_value, exc_traceback)
@@ -86,13 +172,11 @@ def app_logic_thread_func(
     server_log_path: 'Path', # Use Path directly
     shutdown_event_param: threading.Event # Added shutdown event
 ):
-    # Event to signal that GUI content (loading.html) is loaded
-    # This replaces waiting directly on gui_manager.is_window_loaded
-    _gui_initial_content_loaded_event = threading.Event()
-
+    # _gui_content_loaded_event signals that GUI content (loading.html) is loaded.
+    # It is cleared by main(), not here, so a load that lands before this thread starts is not lost.
     def _handle_gui_content_loaded():
         app_logger.info("AppLogic Handler: GUI_WINDOW_CONTENT_LOADED received.")
-        _gui_initial_content_loaded_event.set()
+        _gui_content_loaded_event.set()
 
     event_publisher.subscribe(AppEventType.GUI_WINDOW_CONTENT_LOADED, _handle_gui_content_loaded)
     # No explicit subscription to APPLICATION_QUIT_REQUESTED here, as this thread
@@ -101,28 +185,23 @@ def app_logic_thread_func(
 
     app_logger.info("Started.")
     server_process = None
-    redirect_thread = None
-    redirect_thread_stop_event = threading.Event()
 
     try:
+        # Clearing the port does not need the window, so it overlaps the webview's startup instead of following it.
+        # Statuses set before the page has loaded are held by the GUI manager and shown once it is.
+        gui_manager.set_status("Initializing...")
+        gui_manager.set_status(f"Clearing network port {settings.PORT}...")
+        if not current_server_manager.kill_process_on_port():
+            app_logger.warning(f"Failed to kill process on port {settings.PORT}. Server start might fail if port is busy.")
+
         app_logger.info("Waiting for GUI window to finish loading initial content (via event)...")
-        if not _gui_initial_content_loaded_event.wait(timeout=20):
+        if not _gui_content_loaded_event.wait(timeout=20):
             app_logger.error("GUI window did not signal 'loaded' in time. Aborting app logic.")
             event_publisher.publish(AppEventType.APPLICATION_CRITICAL_ERROR, message="GUI did not load correctly. Check launcher logs.")
             return
         if shutdown_event_param.is_set(): return
 
         app_logger.info("GUI content loaded. Proceeding with server launch sequence.")
-        gui_manager.set_status("Initializing...")
-        if shutdown_event_param.wait(0.5): return
-
-        if shutdown_event_param.is_set(): return
-        gui_manager.set_status(f"Clearing network port {settings.PORT}...")
-        if not current_server_manager.kill_process_on_port():
-            app_logger.warning(f"Failed to kill process on port {settings.PORT}. Server start might fail if port is busy.")
-        if shutdown_event_param.wait(0.5): return
-
-        if shutdown_event_param.is_set(): return
         gui_manager.set_status("Starting ComfyUI server process...")
         server_process = current_server_manager.start_server(server_log_path)
 
@@ -135,25 +214,34 @@ def app_logic_thread_func(
 
         app_logger.info(f"ComfyUI server process started with PID: {server_process.pid}.")
 
-        redirect_thread = threading.Thread(
-            target=gui_manager.redirect_when_ready_loop,
-            args=(redirect_thread_stop_event, shutdown_event_param), # Pass stop events
-            daemon=True
-        )
-        redirect_thread.start()
-        app_logger.info("Redirection loop initiated.")
+        gui_manager.start_server_ready_deadline()
 
         app_logger.info("Now monitoring server process and shutdown event.")
-        while not shutdown_event_param.is_set():
-            if server_process.poll() is not None:
+        server_ready = False
+        probe_interval = SERVER_READY_PROBE_INITIAL_INTERVAL
+        # Local bindings: the loop below resolves these on every pass until the server is ready
+        shutdown_requested, wait_for_shutdown, poll_server = shutdown_event_param.is_set, shutdown_event_param.wait, server_process.poll
+        while not shutdown_requested():
+            if poll_server() is not None:
                 app_logger.info(f"ComfyUI server process (PID: {server_process.pid}) has exited with code {server_process.returncode}.")
                 # Publish an event indicating unexpected server stop
-                if not shutdown_event_param.is_set(): # Only publish if not already shutting down
+                if not shutdown_requested(): # Only publish if not already shutting down
                     event_publisher.publish(AppEventType.SERVER_STOPPED_UNEXPECTEDLY, pid=server_process.pid, returncode=server_process.returncode)
                     shutdown_event_param.set() # Also trigger local shutdown for this thread
                 break
-            if shutdown_event_param.wait(timeout=1):
+            if not server_ready: # Publishes SERVER_READY once; the GUI redirects from its handler
+                server_ready = current_server_manager.check_server_ready(wake_event=shutdown_event_param) # Shutdown cuts a probe short
+            if server_ready: # Nothing left to probe, so stop waking up every second
+                if _block_until_exit_or_shutdown(server_process, shutdown_event_param):
+                    continue # Woken by the exit or the shutdown; the checks above tell which
+                # No pidfd here: a watcher thread blocks on the process and sets the shutdown event if it exits
+                threading.Thread(target=_report_server_exit, args=(app_logger, server_process, shutdown_event_param),
+                                 name="ServerExitWatcher", daemon=True).start()
+                wait_for_shutdown()
+                break
+            if wait_for_shutdown(timeout=probe_interval):
                 break
+            probe_interval = min(probe_interval * 2, SERVER_READY_PROBE_MAX_INTERVAL)
 
     except Exception as e:
         app_logger.error(f"An error occurred: {e}", exc_info=True)
@@ -161,12 +249,6 @@ def app_logic_thread_func(
             event_publisher.publish(AppEventType.APPLICATION_CRITICAL_ERROR, message=f"An unexpected error occurred in the background process: {str(e)}")
     finally:
         app_logger.info("Cleaning up...")
-        redirect_thread_stop_event.set()
-
-        if redirect_thread and redirect_thread.is_alive():
-            app_logger.info("Waiting for redirect thread to join...")
-            redirect_thread.join(timeout=3)
-
         if current_server_manager and server_process and server_process.poll() is None:
             app_logger.info("Shutting down ComfyUI server...")
             current_server_manager.shutdown_server()
@@ -186,6 +268,7 @@ def main():
     app_shutdown_event.clear()
     _app_logic_completed_event.clear()
     _tray_manager_completed_event.clear()
+    _gui_content_loaded_event.clear()
 
     # Initialize LogManager first
     log_manager_instance = LogManager(
@@ -195,17 +278,10 @@ def main():
     launcher_logger = log_manager_instance.get_launcher_logger() # Get the configured logger
     sys.excepthook = custom_excepthook
 
-    # Subscribe main thread handlers
-    event_publisher.subscribe(AppEventType.APPLICATION_QUIT_REQUESTED, _handle_main_thread_quit_request)
-    event_publisher.subscribe(AppEventType.APPLICATION_CRITICAL_ERROR, _handle_critical_error)
-    event_publisher.subscribe(AppEventType.SERVER_STOPPED_UNEXPECTEDLY, _handle_server_stopped_unexpectedly)
-    event_publisher.subscribe(AppEventType.APP_LOGIC_SHUTDOWN_COMPLETE, _handle_app_logic_shutdown_complete)
-    event_publisher.subscribe(AppEventType.TRAY_MANAGER_SHUTDOWN_COMPLETE, _handle_tray_manager_shutdown_complete)
-
     launcher_logger.info(f"Starting {settings.APP_NAME} (Version 1.0)")
-    if settings.DEBUG:
+    if launcher_logger.isEnabledFor(logging.DEBUG): # Same as settings.DEBUG, but follows the logger's actual level
         launcher_logger.debug("Debug mode is ON.")
-        launcher_logger.debug(f"Full configuration loaded: {settings.model_dump_json(indent=2)}")
+        launcher_logger.debug("Full configuration loaded: %s", settings.model_dump_json())
 
     listen_host_for_comfyui = settings.HOST
     connect_host_for_launcher = settings.EFFECTIVE_CONNECT_HOST
@@ -213,130 +289,129 @@ def main():
     launcher_logger.info(f"Launcher will attempt to connect to: {connect_host_for_launcher}:{settings.PORT}")
     server_log_path = settings.LOG_DIR / "server.log"
 
-    try:
-        server_manager_instance = ServerManager(
-            comfyui_path=settings.COMFYUI_PATH,
-            python_executable=settings.PYTHON_EXECUTABLE,
-            listen_host=listen_host_for_comfyui,
-            connect_host=connect_host_for_launcher,
-            port=settings.PORT,
-            logger=launcher_logger
-        )
+    def _handle_gui_content_loaded_set_log_path():
+        # Runs on the GUI's first content-loaded callback, so no thread has to sit waiting for the window
+        gui_manager_instance.set_log_path(str(server_log_path))
+
+    # Main thread handlers stay subscribed until the shutdown sequence below has finished
+    main_thread_handlers = {
+        AppEventType.APPLICATION_QUIT_REQUESTED: _handle_main_thread_quit_request,
+        AppEventType.APPLICATION_CRITICAL_ERROR: _handle_critical_error,
+        AppEventType.SERVER_STOPPED_UNEXPECTEDLY: _handle_server_stopped_unexpectedly,
+        AppEventType.APP_LOGIC_SHUTDOWN_COMPLETE: _handle_app_logic_shutdown_complete,
+        AppEventType.TRAY_MANAGER_SHUTDOWN_COMPLETE: _handle_tray_manager_shutdown_complete,
+        AppEventType.GUI_WINDOW_CONTENT_LOADED: _handle_gui_content_loaded_set_log_path, # Sets the log path in the React app once it's loaded
+    }
+    with event_publisher.subscriptions(main_thread_handlers):
+        try:
+            server_manager_instance = ServerManager(
+                comfyui_path=settings.COMFYUI_PATH,
+                python_executable=settings.PYTHON_EXECUTABLE,
+                listen_host=listen_host_for_comfyui,
+                connect_host=connect_host_for_launcher,
+                port=settings.PORT,
+                logger=launcher_logger
+            )
         
-        gui_manager_instance = GUIManager(
-            app_name=settings.APP_NAME,
-            window_width=settings.WINDOW_WIDTH,
-            window_height=settings.WINDOW_HEIGHT,
-            connect_host=connect_host_for_launcher,
-            port=settings.PORT,
-            assets_dir=settings.ASSETS_DIR,
-            logger=launcher_logger,
-            server_manager=server_manager_instance
-        )
+            gui_manager_instance = GUIManager(
+                app_name=settings.APP_NAME,
+                window_width=settings.WINDOW_WIDTH,
+                window_height=settings.WINDOW_HEIGHT,
+                connect_host=connect_host_for_launcher,
+                port=settings.PORT,
+                assets_dir=settings.ASSETS_DIR,
+                logger=launcher_logger,
+                server_manager=server_manager_instance
+            )
         
-        tray_manager_instance = TrayManager(
-            app_name=settings.APP_NAME,
-            assets_dir=settings.ASSETS_DIR,
-            logger=launcher_logger,
-            shutdown_event=app_shutdown_event, # Pass the event
-            gui_manager=gui_manager_instance  # Pass gui_manager
-        )
+            tray_manager_instance = TrayManager(
+                app_name=settings.APP_NAME,
+                assets_dir=settings.ASSETS_DIR,
+                logger=launcher_logger,
+                shutdown_event=app_shutdown_event, # Pass the event
+                gui_manager=gui_manager_instance  # Pass gui_manager
+            )
         
-        gui_manager_instance.prepare_and_launch_gui(shutdown_event_for_critical_error=app_shutdown_event)
-        
-        # Set the log path in the React app once it's loaded
-        def set_log_path_when_ready():
-            gui_manager_instance.is_window_loaded.wait(timeout=10)  # Wait up to 10 seconds
-            if gui_manager_instance.is_window_loaded.is_set():
-                gui_manager_instance.set_log_path(str(server_log_path))
-        
-        # Start thread to set log path
-        threading.Thread(target=set_log_path_when_ready, daemon=True).start()
-        
-        tray_manager_instance.start()
-
-        app_logic_thread_instance = threading.Thread(
-            target=app_logic_thread_func,
-            args=(launcher_logger, gui_manager_instance, server_manager_instance, server_log_path, app_shutdown_event),
-            daemon=True # Daemon so it exits if main thread exits unexpectedly
-        )
-        app_logic_thread_instance.start()
-        launcher_logger.info(f"{settings.APP_NAME} setup complete. GUI, Tray, and Background thread launched.")
-
-        launcher_logger.info("Entering blocking call gui_manager_instance.start_webview_blocking()...")
-        # This call is blocking. It will return when webview.destroy_window() is called
-        # or if the window is closed and _on_closing doesn't prevent it (which it now does).
-        gui_manager_instance.start_webview_blocking()
-        launcher_logger.info("Returned from gui_manager_instance.start_webview_blocking().")
-
-        # If start_webview_blocking returns, it means the window was either closed by user
-        # (and our _on_closing hid it), or webview.destroy_window() was called.
-        # The application should now wait for the app_shutdown_event to be set (e.g., by the tray's Quit).
-        launcher_logger.info("Webview blocking call has returned. Waiting for application shutdown signal.")
-        app_shutdown_event.wait() # Wait indefinitely; quit is now signaled by event handlers setting this
-        launcher_logger.info("Application shutdown signal received.")
-
-    except Exception as e:
-        launcher_logger.critical(f"An unhandled exception occurred: {e}", exc_info=True)
-        app_shutdown_event.set() # Ensure shutdown is signaled
-    finally:
-        launcher_logger.info("Initiating shutdown sequence (finally block)...")
-        # Ensure app_shutdown_event is set, though it should be by now if quit was graceful.
-        # If an exception occurred before APPLICATION_QUIT_REQUESTED was handled, this ensures it's set.
-        if not app_shutdown_event.is_set():
-            app_shutdown_event.set()
-
-        launcher_logger.info("Checking app logic thread...")
-        if not _app_logic_completed_event.wait(timeout=12): # Increased timeout slightly
-            launcher_logger.info("Waiting for app logic thread to complete...")
-            if app_logic_thread_instance and app_logic_thread_instance.is_alive(): # Check if thread object exists and is alive
-                launcher_logger.warning("App logic thread did not signal completion and is still alive.")
-            elif not app_logic_thread_instance:
-                 launcher_logger.warning("App logic thread instance is None, cannot confirm completion status.")
-        else:
-            launcher_logger.info("App logic thread signaled completion or timed out.")
-
-        # Server shutdown is primarily handled by app_logic_thread_func.
-        # Final check here.
-        launcher_logger.info("Checking server manager for final shutdown...")
-        if server_manager_instance and getattr(server_manager_instance, 'server_process', None) and \
-           server_manager_instance.server_process.poll() is None:
-            launcher_logger.info("Performing final check/attempt to shut down ComfyUI server...")
-            server_manager_instance.shutdown_server()
-        else:
-            launcher_logger.info("Server manager or server process not active for final shutdown.")
-
-        # TrayManager's icon.stop() is handled by its own APPLICATION_QUIT_REQUESTED handler.
-        # We wait for the TRAY_MANAGER_SHUTDOWN_COMPLETE event which is published when its run() loop finishes.
-        launcher_logger.info("Checking TrayManager thread...")
-        if not _tray_manager_completed_event.wait(timeout=5):
-            launcher_logger.info("Waiting for TrayManager thread to complete...")
-            if tray_manager_instance and tray_manager_instance._thread and tray_manager_instance._thread.is_alive():
-                launcher_logger.warning("TrayManager thread did not signal completion and is still alive.")
-        else:
-            launcher_logger.info("TrayManager thread signaled completion or timed out.")
-        launcher_logger.info("Checking GUI manager for window destroy...")
-        if gui_manager_instance and gui_manager_instance.webview_window:
-            launcher_logger.info("Destroying GUI window (final step)...")
-            # Call destroy() directly on the window instance
-            # This might be redundant if TrayManager already destroyed it, but should be safe.
-            try:
-                gui_manager_instance.webview_window.destroy()
-                launcher_logger.info("MAIN THREAD: GUI window destroy command sent (final step).")
-            except Exception as e: # pywebview might raise if already destroyed or other issues
-                launcher_logger.warning(f"MAIN THREAD: Error destroying GUI window (final step, might be already destroyed): {e}")
-        else:
-            launcher_logger.info("GUI manager or webview window not active for destroy.")
-
-        # Unsubscribe main thread handlers
-        event_publisher.unsubscribe(AppEventType.APPLICATION_QUIT_REQUESTED, _handle_main_thread_quit_request)
-        event_publisher.unsubscribe(AppEventType.APPLICATION_CRITICAL_ERROR, _handle_critical_error)
-        event_publisher.unsubscribe(AppEventType.SERVER_STOPPED_UNEXPECTEDLY, _handle_server_stopped_unexpectedly)
-        event_publisher.unsubscribe(AppEventType.APP_LOGIC_SHUTDOWN_COMPLETE, _handle_app_logic_shutdown_complete)
-        event_publisher.unsubscribe(AppEventType.TRAY_MANAGER_SHUTDOWN_COMPLETE, _handle_tray_manager_shutdown_complete)
-
-        launcher_logger.info(f"{settings.APP_NAME} has exited cleanly.")
-        logging.shutdown() # Ensure all log handlers are flushed
+            gui_manager_instance.prepare_and_launch_gui(shutdown_event_for_critical_error=app_shutdown_event)
+
+            tray_manager_instance.start()
+
+            app_logic_thread_instance = threading.Thread(
+                target=app_logic_thread_func,
+                args=(launcher_logger, gui_manager_instance, server_manager_instance, server_log_path, app_shutdown_event),
+                daemon=True # Daemon so it exits if main thread exits unexpectedly
+            )
+            app_logic_thread_instance.start()
+            launcher_logger.info(f"{settings.APP_NAME} setup complete. GUI, Tray, and Background thread launched.")
+
+            launcher_logger.info("Entering blocking call gui_manager_instance.start_webview_blocking()...")
+            # This call is blocking. It will return when webview.destroy_window() is called
+            # or if the window is closed and _on_closing doesn't prevent it (which it now does).
+            gui_manager_instance.start_webview_blocking()
+            launcher_logger.info("Returned from gui_manager_instance.start_webview_blocking().")
+
+            # If start_webview_blocking returns, it means the window was either closed by user
+            # (and our _on_closing hid it), or webview.destroy_window() was called.
+            # The application should now wait for the app_shutdown_event to be set (e.g., by the tray's Quit).
+            launcher_logger.info("Webview blocking call has returned. Waiting for application shutdown signal.")
+            app_shutdown_event.wait() # Wait indefinitely; quit is now signaled by event handlers setting this
+            launcher_logger.info("Application shutdown signal received.")
+
+        except Exception as e:
+            launcher_logger.critical(f"An unhandled exception occurred: {e}", exc_info=True)
+            app_shutdown_event.set() # Ensure shutdown is signaled
+        finally:
+            launcher_logger.info("Initiating shutdown sequence (finally block)...")
+            # Ensure app_shutdown_event is set, though it should be by now if quit was graceful.
+            # If an exception occurred before APPLICATION_QUIT_REQUESTED was handled, this ensures it's set.
+            if not app_shutdown_event.is_set():
+                app_shutdown_event.set()
+
+            launcher_logger.info("Checking app logic thread...")
+            if not _app_logic_completed_event.wait(timeout=12): # Increased timeout slightly
+                launcher_logger.info("Waiting for app logic thread to complete...")
+                if app_logic_thread_instance and app_logic_thread_instance.is_alive(): # Check if thread object exists and is alive
+                    launcher_logger.warning("App logic thread did not signal completion and is still alive.")
+                elif not app_logic_thread_instance:
+                     launcher_logger.warning("App logic thread instance is None, cannot confirm completion status.")
+            else:
+                launcher_logger.info("App logic thread signaled completion or timed out.")
+
+            # Server shutdown is primarily handled by app_logic_thread_func.
+            # Final check here.
+            launcher_logger.info("Checking server manager for final shutdown...")
+            if server_manager_instance and getattr(server_manager_instance, 'server_process', None) and \
+               server_manager_instance.server_process.poll() is None:
+                launcher_logger.info("Performing final check/attempt to shut down ComfyUI server...")
+                server_manager_instance.shutdown_server()
+            else:
+                launcher_logger.info("Server manager or server process not active for final shutdown.")
+
+            # TrayManager's icon.stop() is handled by its own APPLICATION_QUIT_REQUESTED handler.
+            # We wait for the TRAY_MANAGER_SHUTDOWN_COMPLETE event which is published when its run() loop finishes.
+            launcher_logger.info("Checking TrayManager thread...")
+            if not _tray_manager_completed_event.wait(timeout=5):
+                launcher_logger.info("Waiting for TrayManager thread to complete...")
+                if tray_manager_instance and tray_manager_instance._thread and tray_manager_instance._thread.is_alive():
+                    launcher_logger.warning("TrayManager thread did not signal completion and is still alive.")
+            else:
+                launcher_logger.info("TrayManager thread signaled completion or timed out.")
+            launcher_logger.info("Checking GUI manager for window destroy...")
+            if gui_manager_instance and gui_manager_instance.webview_window:
+                launcher_logger.info("Destroying GUI window (final step)...")
+                # Call destroy() directly on the window instance
+                # This might be redundant if TrayManager already destroyed it, but should be safe.
+                try:
+                    gui_manager_instance.webview_window.destroy()
+                    launcher_logger.info("MAIN THREAD: GUI window destroy command sent (final step).")
+                except Exception as e: # pywebview might raise if already destroyed or other issues
+                    launcher_logger.warning(f"MAIN THREAD: Error destroying GUI window (final step, might be already destroyed): {e}")
+            else:
+                launcher_logger.info("GUI manager or webview window not active for destroy.")
+
+            launcher_logger.info(f"{settings.APP_NAME} has exited cleanly.")
+            log_manager_instance.shutdown() # Drain the queued records before the handlers are closed
+            logging.shutdown() # Ensure all log handlers are flushed
 
 
 if __name__ == "__main__":
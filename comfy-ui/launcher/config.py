@@ -1,11 +1,13 @@
 from pathlib import Path
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import platform # Import the platform module
 import re # For parsing resolv.conf
-from typing import Literal # For type hinting the theme preference
+from typing import Literal, Optional # For type hinting the theme preference
 # No need for set_key from dotenv if we are not saving from GUI
 
-DOTENV_PATH = Path(__file__).resolve().parent / '.env'
+_LAUNCHER_ROOT = Path(__file__).resolve().parent # Resolved once at import instead of per property access
+DOTENV_PATH = _LAUNCHER_ROOT / '.env'
 
 class Settings(BaseSettings):
     """
@@ -13,7 +15,7 @@ class Settings(BaseSettings):
     Values can be overridden by creating a .env file in the 'launcher' directory.
     """
     DEBUG: bool = False
-    COMFYUI_PATH: Path = Path(__file__).resolve().parent.parent.parent / "ComfyUI"
+    COMFYUI_PATH: Path = _LAUNCHER_ROOT.parent.parent / "ComfyUI"
     HOST: str = "127.0.0.1" # This is what ComfyUI will --listen on
     PORT: int = 8188
     LOG_DIR_NAME: str = "logs"
@@ -30,15 +32,15 @@ class Settings(BaseSettings):
         extra='ignore'
     )
 
-    @property
+    @cached_property
     def LAUNCHER_ROOT(self) -> Path:
-        return Path(__file__).resolve().parent
-    @property
+        return _LAUNCHER_ROOT
+    @cached_property
     def LOG_DIR(self) -> Path:
         return self.LAUNCHER_ROOT / self.LOG_DIR_NAME
-    @property
+    @cached_property
     def PYTHON_EXECUTABLE(self) -> Path: # type: ignore[override]
-        # Attempt to detect the Python executable within the ComfyUI .venv
+        # Attempt to detect the Python executable within the ComfyUI .venv (probed once, then cached on the instance)
         # This is more robust for cross-environment scenarios (e.g., WSL accessing Windows venv)
         
         venv_path = self.COMFYUI_PATH / ".venv"
@@ -58,22 +60,56 @@ class Settings(BaseSettings):
             # Fallback to the original platform-based guess if no specific venv structure is found.
             # ServerManager will log an error if this path is also invalid.
             return win_style_exec if platform.system() == "Windows" else unix_style_exec
-    @property
+    @cached_property
     def EFFECTIVE_CONNECT_HOST(self) -> str:
         """
         Determines the IP address the launcher should use to connect to ComfyUI
         (In this reverted state, it simply returns the configured HOST value).
+        Cached, so later reads are a plain instance attribute lookup.
         """
         # This reverts to the simplest behavior: always use the HOST setting.
         # If HOST is "127.0.0.1" and the launcher is in WSL,
         # it will attempt to connect to WSL's own loopback.
         return self.HOST
-    @property
+    @cached_property
     def ASSETS_DIR(self) -> Path:
         return self.LAUNCHER_ROOT / "assets"
 
-settings = Settings()
+settings: Settings # Built lazily by the module-level __getattr__ below
+_settings: Optional[Settings] = None
+_settings_dump: Optional[dict] = None # model_dump() of _settings, dropped whenever a new instance is built
+
+def get_settings() -> Settings:
+    """Returns the shared Settings instance, reading the .env file on first use."""
+    global _settings, _settings_dump
+    if _settings is None:
+        _settings = Settings()
+        _settings_dump = None
+    return _settings
+
+def __getattr__(name: str):
+    # PEP 562 hook: `settings` is only constructed when first accessed, so importing
+    # this module (e.g. for type hints) does not parse the .env file.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def reload_settings() -> Settings:
+    """
+    Re-reads the .env file and environment into a fresh shared `settings` instance.
+    Modules that did `from .config import settings` keep their previous reference.
+    """
+    global _settings, _settings_dump
+    _settings = Settings()
+    _settings_dump = None
+    return _settings
 
 def get_all_current_settings() -> dict: # Still useful for debugging if needed
-    """Returns all current settings values as a dictionary."""
-    return Settings().model_dump()
\ No newline at end of file
+    """
+    Returns all current settings values as a dictionary (without re-reading the .env file).
+    The dump is computed once per settings instance; callers get a copy so they cannot alter the cache.
+    """
+    global _settings_dump
+    if _settings_dump is None:
+        _settings_dump = get_settings().model_dump()
+    return _settings_dump.copy()
\ No newline at end of file
@@ -1,15 +1,18 @@
 import threading
-from enum import Enum, auto
-from collections import defaultdict
-from typing import Callable, DefaultDict, List, Any
+from contextlib import contextmanager
+from enum import IntEnum, auto
+from typing import Callable, Dict, Iterator, Mapping, Tuple, Any
 import logging
 
 # Get a logger for the event system itself.
 # It's good practice to use __name__ for module-level loggers.
 event_system_logger = logging.getLogger(__name__)
 
-class AppEventType(Enum):
-    """Defines the types of events that can be published within the application."""
+class AppEventType(IntEnum):
+    """
+    Defines the types of events that can be published within the application.
+    An IntEnum so subscriber lookups use int's C-level hash instead of Enum.__hash__ (hash of the name).
+    """
     # GUI Lifecycle
     GUI_WINDOW_CONTENT_LOADED = auto()  # Fired when the initial loading.html is fully loaded
     GUI_WINDOW_HIDDEN = auto()          # Fired when the GUI window is hidden (e.g., on close attempt)
@@ -19,6 +22,7 @@ class AppEventType(Enum):
     APPLICATION_QUIT_REQUESTED = auto()     # Fired when a quit is initiated (e.g., from tray)
     APPLICATION_CRITICAL_ERROR = auto()     # Fired for critical errors that should halt the app
     SERVER_STOPPED_UNEXPECTEDLY = auto()    # Fired if the ComfyUI server process terminates unexpectedly
+    SERVER_READY = auto()                   # Fired once when the started ComfyUI server first accepts connections
 
     # Shutdown Phase Events - Published by components when their cleanup is done
     APP_LOGIC_SHUTDOWN_COMPLETE = auto()
@@ -34,37 +38,80 @@ class AppEventType(Enum):
     SHOW_WINDOW_REQUEST = auto() # Fired by tray to request GUI to show window
     # SHOW_WINDOW_REQUEST_RELAYED_TO_GUI = auto() # Fired by GUIManager if it processes the request
 
+_ALL_EVENT_TYPES = frozenset(AppEventType) # Built once; membership is a plain hash lookup
+
+def _handler_name(handler: Callable[..., Any]) -> str:
+    """Returns a readable name for a handler, for log messages."""
+    return getattr(handler, '__name__', None) or repr(handler)
+
 class EventPublisher:
-    """A simple publish-subscribe event publisher."""
+    """
+    A simple publish-subscribe event publisher.
+    Each event's handlers are stored as an immutable tuple that (un)subscribe replace under the lock,
+    so publish() can iterate the current tuple without locking or copying it.
+    publish() relies on the GIL making the single dict read atomic; the lock is only held by writers,
+    because building the new tuple is a read-modify-write that two concurrent subscribers could interleave.
+    """
     def __init__(self):
-        self._subscribers: DefaultDict[AppEventType, List[Callable[..., Any]]] = defaultdict(list)
-        self._lock = threading.Lock() # To ensure thread-safe modification of subscribers
+        # Every event type gets its entry up front, so the dict never resizes and publish() can index it directly
+        self._subscribers: Dict[AppEventType, Tuple[Callable[..., Any], ...]] = {event_type: () for event_type in AppEventType}
+        self._lock = threading.Lock() # Serializes subscribe/unsubscribe; publish only reads the current tuple
 
     def subscribe(self, event_type: AppEventType, handler: Callable[..., Any]):
         """Subscribes a handler function to a specific event type."""
-        with self._lock:
-            event_system_logger.debug(f"Subscribing handler '{getattr(handler, '__name__', repr(handler))}' to event '{event_type.name}'")
-            self._subscribers[event_type].append(handler)
+        self.subscribe_many({event_type: handler})
 
     def unsubscribe(self, event_type: AppEventType, handler: Callable[..., Any]):
         """Unsubscribes a handler function from a specific event type."""
+        self.unsubscribe_many({event_type: handler})
+
+    def subscribe_many(self, handlers: Mapping[AppEventType, Callable[..., Any]]):
+        """Subscribes one handler per event type, taking the lock once for the whole batch."""
+        for event_type in handlers: # Validate everything first so a bad entry leaves nothing half-subscribed
+            if event_type not in _ALL_EVENT_TYPES:
+                raise ValueError(f"Unknown event type: {event_type!r}")
         with self._lock:
-            try:
-                self._subscribers[event_type].remove(handler)
-                event_system_logger.debug(f"Unsubscribing handler '{getattr(handler, '__name__', repr(handler))}' from event '{event_type.name}'")
-            except ValueError:
-                event_system_logger.warning(f"Handler '{getattr(handler, '__name__', repr(handler))}' not found for event '{event_type.name}' during unsubscribe.")
+            for event_type, handler in handlers.items():
+                if event_system_logger.isEnabledFor(logging.DEBUG):
+                    event_system_logger.debug(f"Subscribing handler '{_handler_name(handler)}' to event '{event_type.name}'")
+                self._subscribers[event_type] += (handler,)
+
+    def unsubscribe_many(self, handlers: Mapping[AppEventType, Callable[..., Any]]):
+        """Unsubscribes one handler per event type, taking the lock once for the whole batch."""
+        with self._lock:
+            for event_type, handler in handlers.items():
+                subscribed = self._subscribers.get(event_type, ())
+                try:
+                    index = subscribed.index(handler) # Only the first occurrence is removed, as with list.remove()
+                except ValueError:
+                    event_system_logger.warning(f"Handler '{_handler_name(handler)}' not found for event '{event_type.name}' during unsubscribe.")
+                    continue
+                self._subscribers[event_type] = subscribed[:index] + subscribed[index + 1:]
+                if event_system_logger.isEnabledFor(logging.DEBUG):
+                    event_system_logger.debug(f"Unsubscribing handler '{_handler_name(handler)}' from event '{event_type.name}'")
+
+    @contextmanager
+    def subscriptions(self, handlers: Mapping[AppEventType, Callable[..., Any]]) -> Iterator["EventPublisher"]:
+        """Keeps the handlers subscribed for the body of a with block; they are unsubscribed on exit, even on error."""
+        self.subscribe_many(handlers)
+        try:
+            yield self
+        finally:
+            self.unsubscribe_many(handlers)
 
     def publish(self, event_type: AppEventType, *args: Any, **kwargs: Any):
         """Publishes an event, calling all subscribed handlers."""
-        handlers_to_call: List[Callable[..., Any]] = []
-        with self._lock: # Make a copy of handlers to call, in case a handler tries to (un)subscribe during iteration.
-            handlers_to_call = list(self._subscribers.get(event_type, []))
+        # The tuple is never mutated, so a handler (un)subscribing during dispatch cannot affect this iteration.
+        handlers_to_call = self._subscribers[event_type]
+        if not handlers_to_call: # Fast path: nothing subscribed, so skip the log formatting entirely.
+            return
 
-        event_system_logger.info(f"Publishing event '{event_type.name}' to {len(handlers_to_call)} subscriber(s). Args: {args}, Kwargs: {kwargs}")
+        logger = event_system_logger # Local binding: avoids a global lookup per log call in the loop below
+        event_name = event_type.name # Enum .name is a descriptor lookup; resolve it once per publish
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Publishing event '{event_name}' to {len(handlers_to_call)} subscriber(s). Args: {args}, Kwargs: {kwargs}")
         for handler in handlers_to_call:
             try:
-                event_system_logger.debug(f"Calling handler '{getattr(handler, '__name__', repr(handler))}' for event '{event_type.name}'")
                 handler(*args, **kwargs)
             except Exception as e:
-                event_system_logger.error(f"Error in handler '{getattr(handler, '__name__', repr(handler))}' for event '{event_type.name}': {e}", exc_info=True)
\ No newline at end of file
+                logger.error(f"Error in handler '{_handler_name(handler)}' for event '{event_name}': {e}", exc_info=True)
@@ -1,11 +1,14 @@
-import webview
+import functools
+import hashlib
+import json
 import threading
-import time
 from pathlib import Path
 import os
-import platform
-import subprocess
-from typing import Literal, Optional # Added Optional
+import re
+import shutil
+import platform # Already loaded by config.py, so importing it lazily here would gain nothing
+import subprocess # Likewise already loaded by server_manager.py
+from typing import List, Literal, Optional # Added Optional
 
 if platform.system() == "Windows":
     try: import winreg
@@ -16,10 +19,56 @@ else:
 from .config import settings
 from . import event_publisher, AppEventType # Import the global event publisher and event types
 
+webview = None # pywebview; imported on first use by _webview_module() since it drags in the GUI toolkit bindings
+
+def _webview_module():
+    """Returns the pywebview module, importing it on first call. Concurrent first calls are serialized by the import lock."""
+    global webview
+    if webview is None:
+        import webview
+    return webview
+
+LOADING_MINIMAL_CSS = "body { margin: 0; padding: 20px; box-sizing: border-box; background-color: #1a1a1a; color: #f0f0f0; font-family: sans-serif; display: flex; align-items: center; justify-content: center; height: 100vh; text-align: center; } .container { padding: 40px; background-color: #242424; border-radius: 8px; max-width: 500px; } .title { font-size: 1.8em; margin-bottom: 15px; } .accent { color: #0099ff; } #status-message { margin-top: 15px; color: #aaa; min-height: 1.2em; } .spinner { width: 50px; height: 50px; border: 5px solid #555; border-top-color: #0099ff; border-radius: 50%; margin: 0 auto 20px auto; animation: spin_simple 1.2s linear infinite; } @keyframes spin_simple { to { transform: rotate(360deg); } } #loader-wrapper { opacity: 1; } .fade-out { opacity: 0; transition: opacity 0.5s ease-out; }"
+# Matches every placeholder of loading_base.html so the template is filled in one pass; values inserted for one
+# placeholder (e.g. loading.js) are never rescanned for another.
+LOADING_PLACEHOLDER_PATTERN = re.compile(r"\{(CSS_CONTENT|JS_CONTENT|THEME_CLASS)\}")
+CRITICAL_FALLBACK_HTML = """<!DOCTYPE html><html><head><title>Error</title><style>body{font-family:sans-serif;text-align:center;padding:40px;background-color:#333;color:#fff;}h1{color:red;}</style></head>
+                        <body><h1>Critical Error</h1>
+                        <p>If you're seeing this, the application encountered a severe issue and could not load a required file.</p>
+                        <p>Please check the launcher logs for more details.</p>
+                        </body></html>"""
+LOADING_CACHE_INPUTS = ("loading_base.html", "fallback_loading.html", "loading.js") # Assets the generated loading page is built from
+WEBVIEW_PREWARM_JOIN_TIMEOUT = 10 # seconds; create_window proceeds regardless once this elapses
+LOADING_CACHE_KEY_MARKER = "<!-- loading-cache-key: {key} -->" # Appended to loading_generated.html; after </html> so it cannot affect rendering
+# Shared by the theme-query CLI fallbacks. They are local IPC calls, so a short timeout bounds the startup cost of an
+# unresponsive portal; on Windows CREATE_NO_WINDOW skips allocating (and flashing) a console for the child.
+# close_fds=False (safe: descriptors are non-inheritable by default since PEP 446) and an explicit stdin, together
+# with a full program path, let CPython start the child with posix_spawn instead of fork()ing the launcher.
+THEME_QUERY_SUBPROCESS_KWARGS = {"capture_output": True, "text": True, "timeout": 0.5,
+                                 "stdin": subprocess.DEVNULL, "close_fds": False}
+if platform.system() == "Windows":
+    THEME_QUERY_SUBPROCESS_KWARGS["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+def _js_lit(value: str) -> str:
+    """
+    Quotes a Python string as a JS string literal in one C-level pass. ensure_ascii stays on so U+2028/U+2029,
+    which pre-ES2019 engines treat as line terminators inside string literals, come out escaped.
+    """
+    return json.dumps(value)
+
+def _theme_query_command(program: str, *args: str) -> List[str]:
+    """Command line for a theme-query CLI, with the program resolved to a full path when it is on PATH."""
+    return [shutil.which(program) or program, *args]
+
+@functools.lru_cache(maxsize=16)
+def _read_asset_text(asset_path: Path, mtime_ns: int) -> str:
+    """Reads an asset as UTF-8. mtime_ns is part of the cache key, so an edited file is read again."""
+    return asset_path.read_bytes().decode("utf-8")
+
 class GUIManager:
-    # --- Constants for redirect loop ---
-    REDIRECT_LOOP_MAX_WAIT_TIME = 120  # seconds
-    REDIRECT_LOOP_CHECK_INTERVAL = 2  # seconds
+    SERVER_READY_MAX_WAIT_TIME = 120  # seconds to wait for SERVER_READY before showing an error page
+    FADE_OUT_REDIRECT_DELAY = 1.5     # seconds the loading page gets to fade out before the redirect
+    STATUS_COALESCE_WINDOW = 0.05     # seconds set_status() waits so back-to-back updates share one bridge call
 
     def __init__(self, app_name: str, window_width: int, window_height: int,
                  connect_host: str, port: int, assets_dir: Path, logger, server_manager):
@@ -33,20 +82,45 @@ class GUIManager:
         self.web_dist_dir = self.assets_dir.parent / "web_dist"
         self.logger = logger
         self.server_manager = server_manager
-        self.webview_window: Optional[webview.Window] = None # Type hint for clarity
+        self.webview_window: Optional["webview.Window"] = None # Type hint for clarity
         self._loading_html_path: Optional[Path] = None
         self.is_window_loaded = threading.Event()
         self.is_window_shown = threading.Event() # Retained, might be useful
         self.application_is_quitting = False # Flag to indicate if app is quitting
         self.initial_load_done = False # To track if the very first load_html is done
+        self._backend_prewarm_thread: Optional[threading.Thread] = None
+        self._server_ready_deadline: Optional[threading.Timer] = None
+        self._redirect_timer: Optional[threading.Timer] = None
+        self._status_lock = threading.Lock()
+        self._pending_status: Optional[str] = None # Newest status not yet sent to the webview
+        self._status_flush_timer: Optional[threading.Timer] = None
+        self._system_theme: Optional[Literal["dark", "light"]] = None # OS preference, detected at most once
+
+        # Start importing pywebview now so it overlaps with HTML preparation and server startup
+        self._backend_prewarm_thread = threading.Thread(target=self._prewarm_webview_backend,
+                                                        name="WebviewBackendPrewarm", daemon=True)
+        self._backend_prewarm_thread.start()
 
         # Subscribe to events
         event_publisher.subscribe(AppEventType.APPLICATION_QUIT_REQUESTED, self.handle_application_quit_request)
         event_publisher.subscribe(AppEventType.APPLICATION_CRITICAL_ERROR, self.handle_critical_error_event)
         event_publisher.subscribe(AppEventType.SERVER_STOPPED_UNEXPECTEDLY, self.handle_server_stopped_unexpectedly_event)
         event_publisher.subscribe(AppEventType.SHOW_WINDOW_REQUEST, self.handle_show_window_request)
+        event_publisher.subscribe(AppEventType.SERVER_READY, self.handle_server_ready)
 
 
+    def _prewarm_webview_backend(self):
+        """
+        Imports pywebview itself. The platform backend (webview.platforms.*) is left to webview.start(): cocoa and
+        winforms run setup at import time (the NSBundle info, the WebView2/CEF renderer choice) that must follow the
+        GUI and settings webview.start() applies, so importing them early from another thread is not safe.
+        """
+        try:
+            _webview_module()
+            self.logger.debug("Pre-warmed pywebview.")
+        except Exception as e: # Window creation re-imports and reports any real failure
+            self.logger.debug(f"Could not pre-warm pywebview: {e}")
+
     def _on_closing(self, event=None) -> bool: # Added event parameter
         """
         Handles the window close event (e.g., user clicking 'X').
@@ -75,32 +149,33 @@ class GUIManager:
         # Return True to prevent pywebview from closing the window immediately.
         # The actual window destruction will be handled by `handle_application_quit_request`
         # which is subscribed to the APPLICATION_QUIT_REQUESTED event.
-        return True    def on_loaded(self): # Renamed from _on_loaded to match event subscription
+        return True
+
+    def on_loaded(self): # Renamed from _on_loaded to match event subscription
         self.logger.info("🎉 Webview 'on_loaded' event fired!")
-        current_url = self.webview_window.get_current_url() if self.webview_window else "N/A"
-        self.logger.debug(f"Current URL in webview at on_loaded: {current_url}")
 
-        if not self.initial_load_done:
+        if not self.initial_load_done: # The first load is always the React app, so its URL is not fetched
             # This is the first load (React app)
             self.logger.debug("Initial React app loaded. Publishing GUI_WINDOW_CONTENT_LOADED event.")
             event_publisher.publish(AppEventType.GUI_WINDOW_CONTENT_LOADED)
             self.is_window_loaded.set()
             self.initial_load_done = True
+            self._flush_status() # Deliver the newest status set while the page was still loading, if any
             
             # Initialize React app with system theme
-            theme = settings.LAUNCHER_THEME if settings.LAUNCHER_THEME in ["dark", "light"] else self._get_system_theme_preference()
-            self.set_theme(theme)
+            self.set_theme(self._resolve_theme())
             
         else:
-            self.logger.debug("Webview 'loaded' event fired again (e.g., after page navigation).")
+            # get_current_url() is a round trip to the webview, so it is only made once the URL decides something
+            current_url = self.webview_window.get_current_url() if self.webview_window else "N/A"
+            self.logger.debug(f"Webview 'loaded' event fired again (e.g., after page navigation). Current URL: {current_url}")
             if self.webview_window and current_url and "settings.html" in current_url:
                  self.logger.info("Settings page has been loaded into the webview.")
                  self._execute_js("if (typeof initializeSettingsPage === 'function') { initializeSettingsPage(); } else { console.error('initializeSettingsPage function not found on settings.html'); }")
             elif self.webview_window and current_url and ("index.html" in current_url or "web_dist" in current_url):
                  self.logger.info("React app has been (re)loaded into the webview.")
                  # Re-initialize theme if React app reloads
-                 theme = settings.LAUNCHER_THEME if settings.LAUNCHER_THEME in ["dark", "light"] else self._get_system_theme_preference()
-                 self.set_theme(theme)
+                 self.set_theme(self._resolve_theme())
 
 
     def on_shown(self): # Renamed from _on_shown
@@ -109,63 +184,132 @@ class GUIManager:
         if not self.is_window_shown.is_set():
           self.is_window_shown.set()
 
+    def _resolve_theme(self) -> Literal["dark", "light"]:
+        """The explicit LAUNCHER_THEME, else the OS preference. The OS is only queried once per GUIManager."""
+        if settings.LAUNCHER_THEME in ["dark", "light"]:
+            return settings.LAUNCHER_THEME
+        if self._system_theme is None:
+            self._system_theme = self._get_system_theme_preference()
+        return self._system_theme
+
     def _get_system_theme_preference(self) -> Literal["dark", "light"]:
         system_os = platform.system()
         theme: Literal["dark", "light"] = "light"
         if system_os == "Windows":
             if winreg:
                 try:
-                    registry = winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER)
-                    key = winreg.OpenKey(registry, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
-                    value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
-                    winreg.CloseKey(key)
+                    # HKEY_CURRENT_USER is a predefined handle, so no ConnectRegistry handle is needed; the with block
+                    # closes the key even if the query raises
+                    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize") as key:
+                        value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
                     if value == 0: theme = "dark"
                 except Exception: self.logger.debug("Could not determine Windows dark mode via registry.", exc_info=True)
             else: self.logger.debug("winreg module not available for Windows theme detection.")
         elif system_os == "Darwin":
             try:
-                cmd = ["defaults", "read", "-g", "AppleInterfaceStyle"]
-                process = subprocess.run(cmd, capture_output=True, text=True, check=False, timeout=2)
-                if process.returncode == 0 and process.stdout.strip() == "Dark": theme = "dark"
-                self.logger.debug(f"macOS theme detection: stdout='{process.stdout.strip()}', theme='{theme}'")
+                native_theme = self._read_macos_theme_natively()
+                if native_theme is not None:
+                    theme = native_theme
+                    self.logger.debug(f"macOS theme detection via NSUserDefaults: theme='{theme}'")
+                else: # PyObjC not importable; fall back to the `defaults` CLI
+                    cmd = _theme_query_command("defaults", "read", "-g", "AppleInterfaceStyle")
+                    process = subprocess.run(cmd, check=False, **THEME_QUERY_SUBPROCESS_KWARGS)
+                    if process.returncode == 0 and process.stdout.strip() == "Dark": theme = "dark"
+                    self.logger.debug(f"macOS theme detection: stdout='{process.stdout.strip()}', theme='{theme}'")
             except Exception as e: self.logger.error(f"Error detecting macOS theme: {e}.", exc_info=True)
         elif system_os == "Linux":
             try:
-                cmd_xdg = ["gdbus", "call", "--session", "--dest", "org.freedesktop.portal.Desktop",
-                           "--object-path", "/org/freedesktop/portal/desktop",
-                           "--method", "org.freedesktop.portal.Settings.Read",
-                           "org.freedesktop.appearance", "color-scheme"]
-                process_xdg = subprocess.run(cmd_xdg, capture_output=True, text=True, check=True, timeout=2)
-                output_xdg = process_xdg.stdout.strip().lower()
-                if "'color-scheme': <uint32 1>" in output_xdg: theme = "dark"
-                elif "'color-scheme': <uint32 2>" in output_xdg: theme = "light"
-                self.logger.debug(f"Linux XDG portal theme: output='{output_xdg}', theme='{theme}'")
+                native_theme = self._read_linux_theme_natively()
+                if native_theme is not None:
+                    theme = native_theme
+                    self.logger.debug(f"Linux XDG portal theme via Gio: theme='{theme}'")
+                else: # PyGObject not importable; fall back to the gdbus CLI
+                    cmd_xdg = _theme_query_command("gdbus", "call", "--session", "--dest", "org.freedesktop.portal.Desktop",
+                                                   "--object-path", "/org/freedesktop/portal/desktop",
+                                                   "--method", "org.freedesktop.portal.Settings.Read",
+                                                   "org.freedesktop.appearance", "color-scheme")
+                    process_xdg = subprocess.run(cmd_xdg, check=True, **THEME_QUERY_SUBPROCESS_KWARGS)
+                    output_xdg = process_xdg.stdout.strip().lower()
+                    if "'color-scheme': <uint32 1>" in output_xdg: theme = "dark"
+                    elif "'color-scheme': <uint32 2>" in output_xdg: theme = "light"
+                    self.logger.debug(f"Linux XDG portal theme: output='{output_xdg}', theme='{theme}'")
             except Exception as e_xdg: self.logger.info(f"XDG Portal for Linux theme failed: {e_xdg}.")
         else: self.logger.info(f"System theme detection not implemented for OS '{system_os}'.")
         self.logger.info(f"Determined system theme preference: '{theme}' for OS '{system_os}'.")
         return theme
 
+    def _read_macos_theme_natively(self) -> Optional[Literal["dark", "light"]]:
+        """Reads AppleInterfaceStyle in-process through PyObjC (installed with pywebview's Cocoa backend). None if unavailable."""
+        try:
+            from Foundation import NSUserDefaults
+        except ImportError:
+            return None
+        style = NSUserDefaults.standardUserDefaults().stringForKey_("AppleInterfaceStyle")
+        return "dark" if style == "Dark" else "light"
+
+    def _read_linux_theme_natively(self) -> Optional[Literal["dark", "light"]]:
+        """Queries the XDG desktop portal's color-scheme in-process through Gio (installed with pywebview's GTK backend). None if unavailable."""
+        try:
+            from gi.repository import Gio, GLib
+        except (ImportError, ValueError):
+            return None
+        proxy = Gio.DBusProxy.new_for_bus_sync(Gio.BusType.SESSION, Gio.DBusProxyFlags.NONE, None,
+                                               "org.freedesktop.portal.Desktop", "/org/freedesktop/portal/desktop",
+                                               "org.freedesktop.portal.Settings", None)
+        result = proxy.call_sync("Read", GLib.Variant("(ss)", ("org.freedesktop.appearance", "color-scheme")),
+                                 Gio.DBusCallFlags.NONE, 500, None) # 500 ms, same budget as the gdbus fallback
+        color_scheme = result.unpack()[0] # unpack() also unwraps the nested variant; 1 = prefer dark, 2 = prefer light
+        return "dark" if color_scheme == 1 else "light"
+
     def _get_asset_content(self, relative_path: str, is_critical_fallback: bool = False) -> str:
         asset_path = self.assets_dir / relative_path
         try:
-            with open(asset_path, "r", encoding="utf-8") as f: return f.read()
+            return _read_asset_text(asset_path, os.stat(asset_path).st_mtime_ns) # Only a stat() when unchanged
         except FileNotFoundError:
             self.logger.error(f"Asset file not found: {asset_path}")
             if is_critical_fallback:
                 # Return a more user-friendly HTML fallback for critical assets
                 self.logger.critical(f"Critical asset '{relative_path}' not found, and no fallback content available other than the hardcoded one.")
-                return """<!DOCTYPE html><html><head><title>Error</title><style>body{font-family:sans-serif;text-align:center;padding:40px;background-color:#333;color:#fff;}h1{color:red;}</style></head>
-                        <body><h1>Critical Error</h1>
-                        <p>If you're seeing this, the application encountered a severe issue and could not load a required file.</p>
-                        <p>Please check the launcher logs for more details.</p>
-                        </body></html>"""
+                return CRITICAL_FALLBACK_HTML
             return ""
         except Exception as e:
             self.logger.exception(f"Error reading asset file {asset_path}: {e}")
             return ""
 
+    def _loading_cache_key(self, theme_class: str) -> str:
+        """
+        Fingerprints the inputs of the generated loading page: the (size, mtime) of each source asset,
+        the resolved theme and the inline CSS. Only stat() calls are needed, none of the assets are read.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for relative_path in LOADING_CACHE_INPUTS:
+            try:
+                stat_result = os.stat(self.assets_dir / relative_path)
+                digest.update(f"{relative_path}:{stat_result.st_size}:{stat_result.st_mtime_ns};".encode())
+            except OSError:
+                digest.update(f"{relative_path}:missing;".encode())
+        digest.update(theme_class.encode())
+        digest.update(LOADING_MINIMAL_CSS.encode())
+        return digest.hexdigest()
+
+    def _read_cached_loading_html(self, cache_marker: str) -> Optional[str]:
+        """Returns the previously generated loading page if it was built from the same inputs, else None."""
+        try:
+            with open(self._loading_html_path, "r", encoding="utf-8") as f: cached_content = f.read()
+        except OSError:
+            return None
+        return cached_content if cached_content.endswith(cache_marker) else None
+
     def _prepare_loading_html(self):
         self.logger.debug("Preparing full HTML structure for loading page...")
+        theme_class = self._resolve_theme()
+        self._loading_html_path = self.assets_dir.parent / "loading_generated.html"
+        cache_marker = LOADING_CACHE_KEY_MARKER.format(key=self._loading_cache_key(theme_class))
+        cached_content = self._read_cached_loading_html(cache_marker)
+        if cached_content is not None:
+            self.logger.debug(f"Reusing generated loading HTML from: {self._loading_html_path}")
+            return cached_content
+
         html_template_content = self._get_asset_content("loading_base.html")
         if not html_template_content:
             self.logger.error("loading_base.html is missing. Attempting fallback_loading.html.")
@@ -173,46 +317,31 @@ class GUIManager:
             if not html_template_content: raise FileNotFoundError("Both loading_base.html and fallback_loading.html missing.")
 
         js_content = self._get_asset_content("loading.js") or "window.updateStatus = console.log;"
-        minimal_css_content = "body { margin: 0; padding: 20px; box-sizing: border-box; background-color: #1a1a1a; color: #f0f0f0; font-family: sans-serif; display: flex; align-items: center; justify-content: center; height: 100vh; text-align: center; } .container { padding: 40px; background-color: #242424; border-radius: 8px; max-width: 500px; } .title { font-size: 1.8em; margin-bottom: 15px; } .accent { color: #0099ff; } #status-message { margin-top: 15px; color: #aaa; min-height: 1.2em; } .spinner { width: 50px; height: 50px; border: 5px solid #555; border-top-color: #0099ff; border-radius: 50%; margin: 0 auto 20px auto; animation: spin_simple 1.2s linear infinite; } @keyframes spin_simple { to { transform: rotate(360deg); } } #loader-wrapper { opacity: 1; } .fade-out { opacity: 0; transition: opacity 0.5s ease-out; }"
-        content_with_css = html_template_content.replace("{CSS_CONTENT}", minimal_css_content)
-        content_with_js = content_with_css.replace("{JS_CONTENT}", js_content)
-        theme_class = settings.LAUNCHER_THEME if settings.LAUNCHER_THEME in ["dark", "light"] else self._get_system_theme_preference()
-        final_content = content_with_js.replace("{THEME_CLASS}", theme_class)
-        self._loading_html_path = self.assets_dir.parent / "loading_generated.html"
+        substitutions = {"CSS_CONTENT": LOADING_MINIMAL_CSS, "JS_CONTENT": js_content, "THEME_CLASS": theme_class}
+        final_content = LOADING_PLACEHOLDER_PATTERN.sub(lambda match: substitutions[match.group(1)], html_template_content) + "\n" + cache_marker
+        # Written beside the target and swapped in with os.replace, so a crash mid-write never leaves a torn file
+        temp_path = self._loading_html_path.with_name(f"{self._loading_html_path.name}.{os.getpid()}.tmp")
         try:
-            with open(self._loading_html_path, "w", encoding="utf-8") as f: f.write(final_content)
+            with open(temp_path, "w", encoding="utf-8") as f: f.write(final_content)
+            os.replace(temp_path, self._loading_html_path)
             self.logger.debug(f"Generated loading HTML written to: {self._loading_html_path}")
-        except Exception as e: self.logger.warning(f"Could not write generated loading HTML: {e}")
-        return final_content    def _prepare_react_app_html(self):
+        except Exception as e:
+            self.logger.warning(f"Could not write generated loading HTML: {e}")
+            try: os.unlink(temp_path)
+            except OSError: pass
+        return final_content
+
+    def _get_react_app_url(self) -> Optional[str]:
         """
-        Loads the built React app HTML file and returns its content.
+        Returns the file:// URL of the built React app, or None if it has not been built.
+        Loading it by URL (rather than as an html= string) gives the page a real base URL, so its relative
+        asset paths resolve as-is and the webview can cache the bundle between launches.
         """
         react_html_path = self.web_dist_dir / "index.html"
-        try:
-            with open(react_html_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            
-            # Convert paths to file:// URLs for local file access
-            # Use pathlib for cross-platform path handling
-            web_dist_url = react_html_path.parent.as_uri()
-            
-            # Update asset paths to absolute file URLs
-            html_content = html_content.replace('src="./assets/', f'src="{web_dist_url}/assets/')
-            html_content = html_content.replace('href="./assets/', f'href="{web_dist_url}/assets/')
-            html_content = html_content.replace('href="/icon.png"', f'href="{web_dist_url}/icon.png"')
-            
-            self.logger.debug(f"Loaded React app HTML from: {react_html_path}")
-            self.logger.debug(f"Web dist URL: {web_dist_url}")
-            return html_content
-        except FileNotFoundError:
-            self.logger.error(f"React app HTML not found at: {react_html_path}")
-            self.logger.info("Falling back to legacy loading page...")
-            # Fallback to old loading page
-            return self._prepare_loading_html()
-        except Exception as e:
-            self.logger.error(f"Error loading React app HTML: {e}")
-            self.logger.info("Falling back to legacy loading page...")
-            return self._prepare_loading_html()
+        if react_html_path.is_file():
+            return react_html_path.as_uri()
+        self.logger.error(f"React app HTML not found at: {react_html_path}")
+        return None
 
     def _execute_js(self, js_code: str):
         if self.webview_window:
@@ -223,15 +352,36 @@ class GUIManager:
         else:
             self.logger.debug("Cannot execute JS, webview_window is None.")
 
+    def _execute_js_batch(self, snippets: List[str]):
+        """Runs several JS snippets in a single evaluate_js call, since every pywebview bridge round-trip has a fixed cost."""
+        self._execute_js(";".join(snippets))
+
+    @staticmethod
+    def _status_js(message: str) -> str:
+        return f"if(typeof window.updateStatus === 'function') window.updateStatus({_js_lit(message)});"
+
     def set_status(self, message: str):
         self.logger.info(f"[GUI STATUS] {message}")
-        escaped_message = message.replace("\\", "\\\\").replace("'", "\\'")
-        self._execute_js(f"if(typeof window.updateStatus === 'function') window.updateStatus('{escaped_message}');")
+        with self._status_lock:
+            self._pending_status = message
+            if self._status_flush_timer is not None: # A flush is already scheduled; it will send this newer message
+                return
+            self._status_flush_timer = threading.Timer(self.STATUS_COALESCE_WINDOW, self._flush_status)
+            self._status_flush_timer.daemon = True
+            self._status_flush_timer.start()
+
+    def _flush_status(self):
+        with self._status_lock:
+            self._status_flush_timer = None
+            if not self.is_window_loaded.is_set(): # evaluate_js would be dropped; on_loaded sends the newest status
+                return
+            message, self._pending_status = self._pending_status, None
+        if message is not None:
+            self._execute_js(self._status_js(message))
 
     def set_log_path(self, path: str):
         """Set the log file path in the React app"""
-        escaped_path = path.replace("\\", "\\\\").replace("'", "\\'")
-        self._execute_js(f"if(typeof window.setLogPath === 'function') window.setLogPath('{escaped_path}');")
+        self._execute_js(f"if(typeof window.setLogPath === 'function') window.setLogPath({_js_lit(path)});")
 
     def set_theme(self, theme: str):
         """Set the theme in the React app"""
@@ -241,13 +391,24 @@ class GUIManager:
     def py_toggle_devtools(self):
         if self.webview_window: # pragma: no branch
             if settings.DEBUG: self.webview_window.toggle_devtools()
-            else: self.logger.info("Developer Tools are disabled (DEBUG mode is off).")    def prepare_and_launch_gui(self, shutdown_event_for_critical_error: Optional[threading.Event] = None):
+            else: self.logger.info("Developer Tools are disabled (DEBUG mode is off).")
+
+    def prepare_and_launch_gui(self, shutdown_event_for_critical_error: Optional[threading.Event] = None):
         try:
-            html_content = self._prepare_react_app_html()
-            if not html_content: raise RuntimeError("Could not prepare HTML for React app.")
-            self.logger.info("🪟 Creating GUI window by loading HTML content directly...")
-            self.webview_window = webview.create_window(
-                self.app_name, html=html_content, width=self.window_width,
+            react_app_url = self._get_react_app_url()
+            if react_app_url:
+                window_content = {"url": react_app_url}
+                self.logger.info(f"🪟 Creating GUI window for React app at {react_app_url}...")
+            else:
+                self.logger.info("Falling back to legacy loading page...")
+                html_content = self._prepare_loading_html()
+                if not html_content: raise RuntimeError("Could not prepare HTML for the loading page.")
+                window_content = {"html": html_content}
+                self.logger.info("🪟 Creating GUI window by loading HTML content directly...")
+            if self._backend_prewarm_thread is not None:
+                self._backend_prewarm_thread.join(timeout=WEBVIEW_PREWARM_JOIN_TIMEOUT)
+            self.webview_window = _webview_module().create_window(
+                self.app_name, **window_content, width=self.window_width,
                 height=self.window_height, resizable=True,
                 confirm_close=False # Avoid pywebview's own confirm dialog; we handle hide/close in _on_closing
             )
@@ -273,6 +434,8 @@ class GUIManager:
         """
         self.logger.info("GUIManager Handler: APPLICATION_QUIT_REQUESTED received. Proceeding with window destruction.")
         self.application_is_quitting = True
+        self._cancel_server_ready_deadline()
+        self._cancel_redirect() # A pending post-fade redirect has nothing left to do
         
         window_to_destroy = self.webview_window
         if window_to_destroy:
@@ -283,63 +446,50 @@ class GUIManager:
                 self.logger.info("Webview window destroyed by handle_application_quit_request.")
             except Exception as e:
                 self.logger.error(f"Error destroying window in handle_application_quit_request: {e}", exc_info=True)
-        # No need to call window.close() JS anymore, as this handler now directly destroys.    def load_error_page(self, message: str):
+        # No need to call window.close() JS anymore, as this handler now directly destroys.
+
+    def load_error_page(self, message: str):
         self.logger.error(f"Loading error page with message: {message}")
         # Use React app's error handling instead of loading new HTML
-        escaped_message = message.replace("\\", "\\\\").replace("'", "\\'")
-        self._execute_js(f"if(typeof window.showError === 'function') window.showError('{escaped_message}');")
+        self._execute_js(f"if(typeof window.showError === 'function') window.showError({_js_lit(message)});")
 
     def load_critical_error_page(self, message: str):
         self.logger.critical(f"Loading critical error page with message: {message}")
         # Use React app's critical error handling instead of loading new HTML
-        escaped_message = message.replace("\\", "\\\\").replace("'", "\\'")
-        self._execute_js(f"if(typeof window.showCriticalError === 'function') window.showCriticalError('{escaped_message}');")
-
-
-    def redirect_when_ready_loop(self, stop_event: threading.Event,
-                                 overall_shutdown_event: threading.Event):
-        self.logger.info("Redirect loop: Started.")
-        start_time = time.time()
-
-        while not stop_event.is_set() and not overall_shutdown_event.is_set():
-            if time.time() - start_time > self.REDIRECT_LOOP_MAX_WAIT_TIME:
-                self.logger.warning("Redirect loop: Max wait time exceeded for server availability.")
-                if not overall_shutdown_event.is_set(): # Avoid changing page if already shutting down
-                    self.load_error_page("ComfyUI server did not become available in time. Please check server logs.")
-                break
-
-            # Call wait_for_server_availability without the timeout argument
-            if self.server_manager.wait_for_server_availability(retries=1, delay=0.1): # Use small retry/delay for quick check
-                target_url = f"http://{self.connect_host}:{self.port}"
-                self.logger.info(f"Redirect loop: Server is available. Attempting to redirect webview to {target_url}")
-                if self.webview_window:
-                    self._execute_js("if(typeof window.fadeOutLoading === 'function') window.fadeOutLoading();")
-                    time.sleep(1.5) # Give fade out animation time
-                    if not overall_shutdown_event.is_set(): # Check again before loading URL
-                        self.webview_window.load_url(target_url)
-                else:
-                    self.logger.error("Redirect loop: Webview window is not available for redirection.")
-                self.set_status("Connected to ComfyUI.") # Set status on successful connection
-                break
-            else:
-                # Update log message to reflect the actual retry interval
-                self.logger.debug(f"Redirect loop: Server not yet available. Retrying in {self.REDIRECT_LOOP_CHECK_INTERVAL}s...")
+        self._execute_js(f"if(typeof window.showCriticalError === 'function') window.showCriticalError({_js_lit(message)});")
+
+
+    def start_server_ready_deadline(self):
+        """
+        Arms a one-shot timer that shows an error page if SERVER_READY has not arrived in time.
+        Replaces the old polling loop thread: the redirect itself happens in handle_server_ready.
+        """
+        self._cancel_server_ready_deadline()
+        self._server_ready_deadline = threading.Timer(self.SERVER_READY_MAX_WAIT_TIME, self._handle_server_ready_deadline_expired)
+        self._server_ready_deadline.daemon = True
+        self._server_ready_deadline.start()
+
+    def _cancel_server_ready_deadline(self):
+        if self._server_ready_deadline is not None:
+            self._server_ready_deadline.cancel()
+            self._server_ready_deadline = None
 
-            if not self.webview_window or getattr(self.webview_window, 'gui', None) is None:
-                self.logger.info("Redirect loop: Webview window no longer exists. Stopping.")
-                break
-            # Wait for 'check_interval', breaking if stop_event is set.
-            # The main while loop condition handles overall_shutdown_event.
-            if stop_event.wait(self.REDIRECT_LOOP_CHECK_INTERVAL):
-                self.logger.info("Redirect loop: stop_event set during wait. Exiting loop.")
-                break
-        self.logger.info("Redirect loop: Exiting.")
+    def _cancel_redirect(self):
+        if self._redirect_timer is not None:
+            self._redirect_timer.cancel()
+            self._redirect_timer = None
+
+    def _handle_server_ready_deadline_expired(self):
+        self._server_ready_deadline = None
+        self.logger.warning("Max wait time exceeded for server availability.")
+        if not self.application_is_quitting: # Avoid changing page if already shutting down
+            self.load_error_page("ComfyUI server did not become available in time. Please check server logs.")
 
 
     def start_webview_blocking(self):
         if self.webview_window:
             self.logger.debug("Starting webview event loop (blocking)...")
-            webview.start(debug=settings.DEBUG, private_mode=False, http_server=False) # Diagnostic change
+            _webview_module().start(debug=settings.DEBUG, private_mode=False, http_server=False) # Diagnostic change
             self.logger.debug("Webview event loop finished.")
         else:
             self.logger.error("Cannot start webview: window was not created.")
@@ -349,7 +499,31 @@ class GUIManager:
         self.logger.info(f"Event Handler: Received APPLICATION_CRITICAL_ERROR: {message}")
         self.load_critical_error_page(message)
 
+    def handle_server_ready(self):
+        self._cancel_server_ready_deadline()
+        target_url = f"http://{self.connect_host}:{self.port}"
+        self.logger.info(f"Event Handler: Received SERVER_READY. Attempting to redirect webview to {target_url}")
+        self.logger.info("[GUI STATUS] Connected to ComfyUI.")
+        with self._status_lock:
+            self._pending_status = None # A still-pending startup status must not overwrite this one
+        if self.webview_window:
+            # Status update and fade-out share one bridge call
+            self._execute_js_batch([self._status_js("Connected to ComfyUI."),
+                                    "if(typeof window.fadeOutLoading === 'function') window.fadeOutLoading();"])
+            # Fire-and-forget: the event-dispatching thread is not held for the fade-out animation
+            self._redirect_timer = threading.Timer(self.FADE_OUT_REDIRECT_DELAY, self._redirect_to_server, args=(target_url,))
+            self._redirect_timer.daemon = True
+            self._redirect_timer.start()
+        else:
+            self.logger.error("Webview window is not available for redirection.")
+
+    def _redirect_to_server(self, target_url: str):
+        if not self.application_is_quitting and self.webview_window: # Check again before loading URL
+            self.webview_window.load_url(target_url)
+
     def handle_server_stopped_unexpectedly_event(self, pid: int, returncode: int):
+        self._cancel_server_ready_deadline() # The stopped-server page takes precedence over the timeout page
+        self._cancel_redirect() # Likewise over a redirect still waiting out the fade-out, which would only be refused
         # Import app_shutdown_event locally to avoid circular dependency at module level if __main__ imports GUIManager
         from comfy_launcher.__main__ import app_shutdown_event as global_app_shutdown_event
         if global_app_shutdown_event.is_set():
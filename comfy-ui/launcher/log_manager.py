@@ -1,9 +1,12 @@
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from datetime import datetime, timedelta
 import sys
 import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 
 class LogManager:
     def __init__(self, log_dir: Path, debug_mode: bool, 
@@ -13,6 +16,8 @@ class LogManager:
         self.debug_mode = debug_mode
         self.max_files_to_keep_in_archive = max_files_to_keep_in_archive
         self.max_log_age_days = max_log_age_days
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self._cleanup_thread: Optional[threading.Thread] = None
 
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.archive_dir.mkdir(exist_ok=True)
@@ -30,6 +35,9 @@ class LogManager:
 
         if logger.hasHandlers():
             for handler in logger.handlers[:]:
+                listener = getattr(handler, "listener", None)
+                if listener is not None: # A previous session's background writer; drain it before replacing it
+                    listener.stop()
                 handler.close()
                 logger.removeHandler(handler)
 
@@ -38,14 +46,20 @@ class LogManager:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(console_formatter)
         console_handler.setLevel(logging.DEBUG if self.debug_mode else logging.INFO)
-        logger.addHandler(console_handler)
 
         launcher_log_file = self.log_dir / "launcher.log"
         # File Handler (always added, level determined by logger.setLevel)
         file_formatter = logging.Formatter("[%(asctime)s] [%(levelname)-8s] [%(module)s:%(funcName)s:%(lineno)d] %(message)s")
         file_handler = logging.FileHandler(launcher_log_file, mode='w', encoding='utf-8')
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+
+        # Callers only enqueue records; console and file I/O happen on the listener's background thread
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        queue_handler.listener = self._log_listener
+        self._log_listener.start()
+        logger.addHandler(queue_handler)
 
         logger.info("=" * 50)
         logger.info("Launcher logger initialized for new session.")
@@ -55,53 +69,93 @@ class LogManager:
         """Returns the configured launcher logger instance."""
         return self.launcher_logger
 
+    def shutdown(self):
+        """
+        Writes out any queued log records and stops the background writer thread. The console and file handlers
+        are then attached to the logger directly, so anything logged afterwards (e.g. the excepthook reporting an
+        exception raised during teardown) is still written instead of queued with nothing left to drain it.
+        """
+        listener = self._log_listener
+        if listener is None:
+            return
+        self._log_listener = None
+        queue_handlers = [handler for handler in self.launcher_logger.handlers if getattr(handler, "listener", None) is listener]
+        for handler in queue_handlers:
+            self.launcher_logger.removeHandler(handler)
+        listener.stop()
+        if queue_handlers: # Still this session's logger; a newer LogManager may have replaced the handlers already
+            for handler in listener.handlers:
+                self.launcher_logger.addHandler(handler)
+
     def _rotate_log_file(self, basename: str, logger_to_use: logging.Logger):
         log_file = self.log_dir / basename
-        if log_file.exists():
-            if log_file.stat().st_size > 0:
-                try:
-                    timestamp = datetime.fromtimestamp(log_file.stat().st_mtime).strftime("%Y-%m-%d_%H-%M-%S")
-                    base, ext = os.path.splitext(basename)
-                    rotated_name = f"{base}_{timestamp}{ext}"
-                    destination = self.archive_dir / rotated_name
-
-                    counter = 0
-                    while destination.exists():
-                        counter += 1
-                        rotated_name = f"{base}_{timestamp}_{counter}{ext}"
-                        destination = self.archive_dir / rotated_name
-
-                    os.rename(log_file, destination)
-                    logger_to_use.info(f"Rotated previous log '{log_file.name}' to archive as '{destination.name}'")
-                except Exception as e:
-                    logger_to_use.error(f"Could not rotate log file {log_file}: {e}", exc_info=True)
-            else:
-                try:
-                    os.unlink(log_file)
-                    logger_to_use.info(f"Deleted empty previous log file: {log_file.name}")
-                except Exception as e:
-                    logger_to_use.error(f"Could not delete empty log file {log_file}: {e}", exc_info=True)
-
-    def _cleanup_archived_logs(self, base_name: str, logger_to_use: logging.Logger):
+        try:
+            st = os.stat(log_file) # One stat covers the existence check, the size and the mtime
+        except FileNotFoundError:
+            return
+        if st.st_size > 0:
+            try:
+                timestamp = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d_%H-%M-%S")
+                base, ext = os.path.splitext(basename)
+                rotated_name = f"{base}_{timestamp}{ext}"
+
+                with os.scandir(self.archive_dir) as entries: # One listing; the collision loop below then never touches the disk
+                    existing_names = {entry.name for entry in entries}
+                counter = 0
+                while rotated_name in existing_names:
+                    counter += 1
+                    rotated_name = f"{base}_{timestamp}_{counter}{ext}"
+                destination = self.archive_dir / rotated_name
+
+                os.replace(log_file, destination)
+                logger_to_use.info(f"Rotated previous log '{log_file.name}' to archive as '{destination.name}'")
+            except Exception as e:
+                logger_to_use.error(f"Could not rotate log file {log_file}: {e}", exc_info=True)
+        else:
+            try:
+                os.unlink(log_file)
+                logger_to_use.info(f"Deleted empty previous log file: {log_file.name}")
+            except Exception as e:
+                logger_to_use.error(f"Could not delete empty log file {log_file}: {e}", exc_info=True)
+
+    def _scan_archived_logs(self, base_names: Sequence[str]) -> Dict[str, List[Tuple[float, Path]]]:
+        """
+        Lists the archived '<base_name>_*.log' files for every base name in one scandir pass, newest first.
+        Each file is stat()ed once; its mtime is reused for both the sort and the age check.
+        """
+        prefixes = [(f"{base_name}_", base_name) for base_name in base_names]
+        found: Dict[str, List[Tuple[float, Path]]] = {base_name: [] for base_name in base_names}
+        with os.scandir(self.archive_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".log") or not entry.is_file():
+                    continue
+                for prefix, base_name in prefixes:
+                    if entry.name.startswith(prefix):
+                        found[base_name].append((entry.stat().st_mtime, Path(entry.path)))
+                        break
+        for backup_logs in found.values():
+            backup_logs.sort(reverse=True)
+        return found
+
+    def _cleanup_archived_logs(self, base_name: str, logger_to_use: logging.Logger,
+                               backup_logs: Optional[List[Tuple[float, Path]]] = None):
+        """Applies the age and count limits to one base name's archive. backup_logs is a prior _scan_archived_logs() result."""
         logger_to_use.info(f"Cleaning up old '{base_name}' logs from archive: {self.archive_dir}")
         try:
-            now = datetime.now()
-            backup_logs = sorted(
-                self.archive_dir.glob(f"{base_name}_*.log"),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )
+            # Anything modified at or before the cutoff is at least max_log_age_days old
+            cutoff_mtime = (datetime.now() - timedelta(days=self.max_log_age_days)).timestamp()
+            if backup_logs is None:
+                backup_logs = self._scan_archived_logs([base_name])[base_name]
             logger_to_use.debug(f"Found {len(backup_logs)} archived '{base_name}' logs for potential cleanup.")
 
             files_to_delete = set()
-            for i, log_file in enumerate(backup_logs):
-                age = now - datetime.fromtimestamp(log_file.stat().st_mtime)
+            for i, (mtime, log_file) in enumerate(backup_logs):
                 marked_for_deletion_this_file = False
                 reason_parts = []
 
-                if age.days >= self.max_log_age_days:
+                if mtime <= cutoff_mtime:
                     marked_for_deletion_this_file = True
-                    reason_parts.append(f"age {age.days}d >= {self.max_log_age_days}d")
+                    reason_parts.append(f"older than {self.max_log_age_days}d")
 
                 if i >= self.max_files_to_keep_in_archive:
                     marked_for_deletion_this_file = True
@@ -135,6 +189,18 @@ class LogManager:
         self._rotate_log_file("launcher.log", _internal_logger)
         self._rotate_log_file("server.log", _internal_logger) # Manages server.log rotation
 
-        _internal_logger.info(f"Cleaning up old archived logs...")
-        self._cleanup_archived_logs("launcher", _internal_logger)
-        self._cleanup_archived_logs("server", _internal_logger) # Manages server.log cleanup
+        # The renames above must finish before the new launcher.log/server.log are opened, but pruning the archive
+        # (a glob, a stat per file and the deletes) has nothing waiting on it, so it runs off the startup path.
+        self._cleanup_thread = threading.Thread(target=self._cleanup_all_archived_logs, args=(_internal_logger,),
+                                                name="LogArchiveCleanup", daemon=True)
+        self._cleanup_thread.start()
+
+    def _cleanup_all_archived_logs(self, logger_to_use: logging.Logger):
+        logger_to_use.info(f"Cleaning up old archived logs...")
+        try:
+            archived = self._scan_archived_logs(("launcher", "server")) # One directory walk for both base names
+        except OSError as e:
+            logger_to_use.error(f"Could not list archived logs in {self.archive_dir}: {e}", exc_info=True)
+            return
+        self._cleanup_archived_logs("launcher", logger_to_use, archived["launcher"])
+        self._cleanup_archived_logs("server", logger_to_use, archived["server"]) # Manages server.log cleanup
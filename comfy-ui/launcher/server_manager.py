@@ -1,17 +1,119 @@
 import subprocess
 import signal
 import time
-import psutil # type: ignore
+import threading
 import socket
+import selectors
+import errno
+import struct
 from pathlib import Path
 import platform
 import os # For os.kill / os.killpg
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
+
+from . import event_publisher, AppEventType
 
 if TYPE_CHECKING:
     from logging import Logger # For type hinting
 
+psutil = None # Imported on first use by _psutil_module(); a free port or the Linux lookup never needs it
+
+def _psutil_module():
+    """Returns the psutil module, importing it on first call."""
+    global psutil
+    if psutil is None:
+        import psutil # type: ignore
+    return psutil
+
+# connect_ex() results meaning "handshake under way" on a non-blocking socket (WSAEWOULDBLOCK on Windows)
+CONNECT_IN_PROGRESS = frozenset({errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)})
+
+PROC_ROOT = Path("/proc")
+PROC_NET_TCP_TABLES = ("net/tcp", "net/tcp6") # Relative to PROC_ROOT; net/tcp6 is absent when IPv6 is disabled
+PROC_TCP_LISTEN_STATE = "0A" # Value of the `st` column for TCP_LISTEN
+# sock_diag netlink protocol (linux/netlink.h, linux/inet_diag.h)
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST_DUMP = 0x1 | 0x300 # NLM_F_REQUEST | NLM_F_DUMP
+NLMSG_ERROR, NLMSG_DONE = 2, 3
+TCP_LISTEN = 10
+NLMSG_HEADER = struct.Struct("=IHHII") # len, type, flags, seq, pid
+INET_DIAG_REQ_V2 = struct.Struct("=BBBxI48s") # family, protocol, ext, pad, states, inet_diag_sockid
+INET_DIAG_MSG_SPORT_OFFSET = 4 # Big-endian u16 at the start of the embedded inet_diag_sockid
+INET_DIAG_MSG_INODE_OFFSET = 68 # After the sockid (48 bytes) and the expires/rqueue/wqueue/uid fields
+
+def _listening_socket_inodes_netlink(port: int) -> set:
+    """
+    Asks the kernel for TCP listeners on `port` with one sock_diag request per address family; the kernel
+    skips listeners whose source port differs, so nothing is walked in Python. Raises OSError if netlink is unavailable.
+    """
+    inodes = set()
+    sock_id = struct.pack("!HH", port, 0) + bytes(44) # idiag_sport, idiag_dport, then zeroed addresses/interface/cookie
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_SOCK_DIAG) as sock:
+        for family in (socket.AF_INET, socket.AF_INET6):
+            request = INET_DIAG_REQ_V2.pack(family, socket.IPPROTO_TCP, 0, 1 << TCP_LISTEN, sock_id)
+            sock.sendall(NLMSG_HEADER.pack(NLMSG_HEADER.size + len(request), SOCK_DIAG_BY_FAMILY, NLM_F_REQUEST_DUMP, family, 0) + request)
+            while not _collect_inet_diag_listeners(sock.recv(65536), port, inodes):
+                pass
+    return inodes
+
+def _collect_inet_diag_listeners(data: bytes, port: int, inodes: set) -> bool:
+    """Adds the inodes of matching inet_diag_msg records in one netlink datagram. Returns True once NLMSG_DONE is seen."""
+    offset = 0
+    while offset + NLMSG_HEADER.size <= len(data):
+        msg_len, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+        if msg_type == NLMSG_DONE:
+            return True
+        body = offset + NLMSG_HEADER.size
+        if msg_type == NLMSG_ERROR:
+            error_code = -struct.unpack_from("=i", data, body)[0]
+            raise OSError(error_code, os.strerror(error_code))
+        if msg_len < NLMSG_HEADER.size:
+            raise OSError(f"Malformed netlink message (length {msg_len})")
+        (sport,) = struct.unpack_from("!H", data, body + INET_DIAG_MSG_SPORT_OFFSET)
+        if data[body + 1] == TCP_LISTEN and sport == port:
+            inodes.add(struct.unpack_from("=I", data, body + INET_DIAG_MSG_INODE_OFFSET)[0])
+        offset += (msg_len + 3) & ~3 # NLMSG_ALIGN
+    return False
+
+def _listening_socket_inodes(port: int, proc_root: Path) -> set:
+    """
+    Returns the inodes of TCP sockets listening on `port`, read straight from /proc/net/tcp{,6}.
+    Rows are rejected on the hex port suffix before anything else is looked at. Raises OSError without procfs.
+    """
+    port_suffix = f":{port:04X}"
+    inodes = set()
+    for table in PROC_NET_TCP_TABLES:
+        try:
+            with open(proc_root / table, "r", encoding="ascii") as f:
+                next(f, None) # Header row
+                for line in f:
+                    fields = line.split() # [1] local "HEXIP:HEXPORT", [3] state, [9] inode
+                    if fields[1].endswith(port_suffix) and fields[3] == PROC_TCP_LISTEN_STATE and fields[9] != "0":
+                        inodes.add(fields[9])
+        except FileNotFoundError:
+            if table == PROC_NET_TCP_TABLES[0]: raise # No procfs at all
+    return inodes
+
+def _pid_owning_socket(inodes: set, proc_root: Path) -> Optional[int]:
+    """Finds the PID holding one of the socket inodes via the /proc/[pid]/fd links. Processes we may not inspect are skipped."""
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    for proc_entry in os.scandir(proc_root):
+        if not proc_entry.name.isdigit(): continue
+        try:
+            for fd_entry in os.scandir(os.path.join(proc_entry.path, "fd")):
+                try:
+                    if os.readlink(fd_entry.path) in targets: return int(proc_entry.name)
+                except OSError: continue # fd closed while scanning
+        except OSError: continue # Process exited, or belongs to another user
+    return None
+
 class ServerManager:
+    # Shutdown phases, in seconds: wait after the first stop signal, wait after repeating it, then wait after SIGKILL
+    SHUTDOWN_GRACE_PERIOD = 2.0
+    SHUTDOWN_SECOND_SIGNAL_PERIOD = 3.0
+    SHUTDOWN_KILL_WAIT = 1.0
+
     def __init__(self, comfyui_path: Path, python_executable: Path,
                  listen_host: str, connect_host: str, port: int, logger: 'Logger'):
         self.comfyui_path = comfyui_path
@@ -21,27 +123,72 @@ class ServerManager:
         self.port = port
         self.logger = logger
         self.server_process: Optional[subprocess.Popen] = None # Store the managed process
+        self.server_ready = False # Set once the managed server has accepted a connection
+        self._connect_addrinfo: Optional[List[tuple]] = None # getaddrinfo() results for connect_host:port, resolved on first probe
 
     def kill_process_on_port(self):
         self.logger.debug(f"Checking for processes on port {self.port}...")
+        if self._port_is_free():
+            self.logger.debug(f"Port {self.port} is free. Nothing to terminate.")
+            return
         try:
-            for conn in psutil.net_connections(kind='inet'):
-                if conn.laddr and conn.laddr.port == self.port and conn.status == 'LISTEN' and conn.pid:
-                    proc = psutil.Process(conn.pid)
-                    self.logger.warning(f"🔴 Port {self.port} is in use by PID {proc.pid} ({proc.name()}). Attempting to terminate...")
-                    proc.kill() # Send SIGKILL
-                    proc.wait(timeout=5) # Wait for termination
-                    self.logger.info(f"✅ PID {proc.pid} terminated.")
-                    return # Assume only one process needs to be killed for the port
-        except psutil.NoSuchProcess:
-            self.logger.debug(f"Process on port {self.port} already terminated during check.")
-        except psutil.AccessDenied as e:
-            self.logger.error(f"⚠️ Access denied trying to kill process on port {self.port}. Error: {e}")
-        except Exception as e:
-            self.logger.error(f"⚠️ An unexpected error occurred while trying to kill process on port {self.port}: {e}", exc_info=True)
+            pid = self._find_pid_listening_on_port()
+            if pid:
+                proc = _psutil_module().Process(pid)
+                self.logger.warning(f"🔴 Port {self.port} is in use by PID {proc.pid} ({proc.name()}). Attempting to terminate...")
+                proc.kill() # Send SIGKILL
+                proc.wait(timeout=5) # Wait for termination
+                self.logger.info(f"✅ PID {proc.pid} terminated.")
+                return # Assume only one process needs to be killed for the port
+        except Exception as e: # Only once psutil has been imported can this be one of its errors
+            if psutil is not None and isinstance(e, psutil.NoSuchProcess):
+                self.logger.debug(f"Process on port {self.port} already terminated during check.")
+            elif psutil is not None and isinstance(e, psutil.AccessDenied):
+                self.logger.error(f"⚠️ Access denied trying to kill process on port {self.port}. Error: {e}")
+            else:
+                self.logger.error(f"⚠️ An unexpected error occurred while trying to kill process on port {self.port}: {e}", exc_info=True)
         
         self.logger.debug(f"No active conflicting process found on port {self.port}, or termination handled.")
 
+    def _port_is_free(self) -> bool:
+        """
+        Probes the port with a single bind(), which succeeds in the common case of a fresh launch and lets the
+        socket enumeration be skipped. Any failure (EADDRINUSE, an unbindable host) means "enumerate to find out".
+        """
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if hasattr(socket, "SO_EXCLUSIVEADDRUSE"): # Windows: without it bind() can succeed alongside an existing listener
+                probe.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+            probe.bind((self.listen_host, self.port))
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def _find_pid_listening_on_port(self) -> Optional[int]:
+        """
+        On Linux, asks the kernel over sock_diag netlink for the listener's inode (or reads the TCP tables in /proc if
+        netlink is unavailable) instead of having psutil enumerate every socket on the host.
+        Falls back to psutil.net_connections elsewhere, or if procfs is unavailable.
+        """
+        if platform.system() == "Linux":
+            try:
+                try:
+                    inodes = _listening_socket_inodes_netlink(self.port)
+                except OSError as e:
+                    self.logger.debug(f"sock_diag netlink query failed ({e}). Reading TCP tables from {PROC_ROOT} instead.")
+                    inodes = _listening_socket_inodes(self.port, PROC_ROOT)
+                return _pid_owning_socket(inodes, PROC_ROOT) if inodes else None
+            except OSError as e:
+                self.logger.debug(f"Could not read TCP tables from {PROC_ROOT} ({e}). Falling back to psutil.")
+        psutil_module = _psutil_module()
+        port, listen_status = self.port, psutil_module.CONN_LISTEN # Locals for the per-connection loop
+        for conn in psutil_module.net_connections(kind='tcp'): # Only TCP sockets can listen; 'inet' would also collect UDP
+            # Cheapest, most selective test first; a psutil.Process is only built by the caller for the match
+            if conn.status == listen_status and conn.laddr and conn.laddr.port == port and conn.pid:
+                return conn.pid
+        return None
 
     def start_server(self, server_log_path: Path) -> Optional[subprocess.Popen]:
         self.logger.info(f"🔧 Launching ComfyUI server from: {self.comfyui_path}")
@@ -78,7 +225,8 @@ class ServerManager:
 
 
         creation_flags = 0
-        if platform.system() == "Windows":
+        is_windows = platform.system() == "Windows"
+        if is_windows:
             # For Windows, CREATE_NEW_PROCESS_GROUP allows os.kill with CTRL_BREAK_EVENT
             # to be sent to the entire process group, which is good for shutting down
             # child processes that ComfyUI might spawn.
@@ -86,19 +234,25 @@ class ServerManager:
             creation_flags = subprocess.CREATE_NEW_PROCESS_GROUP
 
 
+        # No preexec_fn (or user/group switching) here: that keeps CPython 3.10+ on its vfork() path on Linux, so the
+        # launcher's address space (webview, pystray, Pillow) is not page-table-copied just to exec the server.
         try:
-            # Open the log file in 'w' mode to overwrite for each start_server call.
-            with open(server_log_path, "w", encoding="utf-8") as comfy_log_file:
+            # Open the log file in 'w' mode to overwrite for each start_server call. Only its descriptor is handed to
+            # the child, which writes raw bytes and controls its own buffering, so no text layer or buffer is set up here.
+            with open(server_log_path, "wb", buffering=0) as comfy_log_file:
                 process = subprocess.Popen(
                     command,
                     cwd=str(self.comfyui_path), # CRITICAL: Set CWD to ComfyUI's root path
                     stdout=comfy_log_file,
                     stderr=subprocess.STDOUT, # Redirect stderr to the same file as stdout
-                    creationflags=creation_flags
-                    # start_new_session=True # On Linux/macOS, this makes the process group leader
+                    creationflags=creation_flags,
+                    # On Linux/macOS the server leads a new session, hence its own process group whose pgid is its pid;
+                    # shutdown_server signals that group without looking the pgid up.
+                    start_new_session=not is_windows
                 )
             self.logger.info(f"ComfyUI server process started with PID: {process.pid}")
             self.server_process = process # Store the process
+            self.server_ready = False
             return self.server_process
         except FileNotFoundError: 
             # This specific error is less likely now with the explicit path checks above,
@@ -111,20 +265,64 @@ class ServerManager:
             self.server_process = None
             return None
 
-    def wait_for_server_availability(self, retries=120, delay=1.0) -> bool:
-        self.logger.info(f"Waiting for ComfyUI server to be available at http://{self.connect_host}:{self.port}/ (ComfyUI instructed to listen on {self.listen_host}:{self.port})")
-        for i in range(retries):
+    def _probe_connection(self, timeout: float, wake_event: Optional[threading.Event] = None):
+        """
+        One connection attempt to connect_host:port. Like socket.create_connection, every resolved address is tried
+        in turn (e.g. "localhost" may resolve to ::1 first while the server only listens on 127.0.0.1), and the last
+        error is raised if none accepts. Raises OSError (socket.timeout) on failure.
+        If `wake_event` has a fileno() (the launcher's selectable shutdown event), setting it also ends the wait.
+        """
+        if self._connect_addrinfo is None: # Resolve once; every later probe is then just socket syscalls
+            self._connect_addrinfo = socket.getaddrinfo(self.connect_host, self.port, type=socket.SOCK_STREAM)
+        last_error: Optional[OSError] = None
+        for family, socktype, proto, _, sockaddr in self._connect_addrinfo:
             try:
-                with socket.create_connection((self.connect_host, self.port), timeout=1): # Use connect_host
-                    self.logger.info(f"✅ Server is available! (Attempt {i+1})")
-                    return True
-            except (socket.timeout, ConnectionRefusedError, OSError) as e:
-                if i % 10 == 0 : # Log less frequently during wait
-                    self.logger.debug(f"Server not yet available (attempt {i+1}/{retries} on {self.connect_host}:{self.port}): {e}")
-                time.sleep(delay)
-        
-        self.logger.error(f"Server at {self.connect_host}:{self.port} did not become available after {retries * delay:.0f} seconds.")
-        return False
+                self._probe_address(family, socktype, proto, sockaddr, timeout, wake_event)
+                return
+            except InterruptedError: # Shutdown requested: do not move on to the next address
+                raise
+            except OSError as e:
+                last_error = e
+        raise last_error if last_error is not None else OSError(f"No addresses resolved for {self.connect_host}:{self.port}")
+
+    def _probe_address(self, family: int, socktype: int, proto: int, sockaddr: tuple, timeout: float,
+                       wake_event: Optional[threading.Event]):
+        """
+        One connection attempt to a single resolved address. The connect is non-blocking and waited on with a
+        selector, so an accepting server is seen as soon as the handshake completes.
+        """
+        with socket.socket(family, socktype, proto) as sock:
+            sock.setblocking(False)
+            error_code = sock.connect_ex(sockaddr)
+            if error_code in CONNECT_IN_PROGRESS:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    if callable(getattr(wake_event, "fileno", None)):
+                        selector.register(wake_event, selectors.EVENT_READ)
+                    if not selector.select(timeout):
+                        raise socket.timeout("timed out")
+                    if wake_event is not None and wake_event.is_set():
+                        raise InterruptedError("Connection attempt abandoned: shutdown requested")
+                error_code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error_code:
+                raise OSError(error_code, os.strerror(error_code))
+
+    def check_server_ready(self, wake_event: Optional[threading.Event] = None) -> bool:
+        """
+        Probes the server with a single connection attempt and publishes SERVER_READY the first time it succeeds.
+        Meant to be called periodically by whoever already monitors the server process; returns True once ready.
+        Setting `wake_event` (the launcher's shutdown event) abandons an in-flight probe; see _probe_connection.
+        """
+        if self.server_ready:
+            return True
+        try:
+            self._probe_connection(timeout=1, wake_event=wake_event)
+        except OSError: # Includes ConnectionRefusedError, socket.timeout and an abandoned probe (InterruptedError)
+            return False
+        self.server_ready = True
+        self.logger.info(f"✅ Server is available at http://{self.connect_host}:{self.port}/")
+        event_publisher.publish(AppEventType.SERVER_READY)
+        return True
 
     def shutdown_server(self): # No longer takes 'process' as an argument
         if not self.server_process or self.server_process.poll() is not None:
@@ -135,38 +333,27 @@ class ServerManager:
         process_to_terminate = self.server_process
         pid_to_terminate = process_to_terminate.pid
         self.logger.info(f"💤 Attempting to shut down ComfyUI server (PID: {pid_to_terminate})...")
+        shutdown_started = time.monotonic()
 
         try:
-            if platform.system() == "Windows":
-                self.logger.debug(f"Sending CTRL_BREAK_EVENT to process group {pid_to_terminate} (Windows).")
-                # This sends to the entire process group if CREATE_NEW_PROCESS_GROUP was used
-                os.kill(pid_to_terminate, signal.CTRL_BREAK_EVENT)
-            else:
-                # On Linux/macOS, try to terminate the process group first
-                try:
-                    pgid = os.getpgid(pid_to_terminate)
-                    self.logger.debug(f"Sending SIGTERM to process group {pgid} (Unix-like).")
-                    os.killpg(pgid, signal.SIGTERM)
-                except ProcessLookupError: # Process might have died quickly
-                     self.logger.info(f"Process {pid_to_terminate} not found for SIGTERM, likely already exited.")
-                except AttributeError: # os.getpgid might not be available on all POSIX-like systems
-                    self.logger.debug(f"os.getpgid not available. Sending SIGTERM directly to process {pid_to_terminate}.")
-                    process_to_terminate.send_signal(signal.SIGTERM) # Fallback to sending to just the process
-                except Exception as e_pg: # Catch other potential errors with pgid/killpg
-                    self.logger.warning(f"Error sending SIGTERM to process group {pid_to_terminate}: {e_pg}. Falling back to direct SIGTERM.")
-                    process_to_terminate.send_signal(signal.SIGTERM)
-
-
-            process_to_terminate.wait(timeout=10) # Wait for graceful exit
+            # wait() returns as soon as the process exits, so these periods only bound an unresponsive server
+            self._send_stop_signal(process_to_terminate)
+            try:
+                process_to_terminate.wait(timeout=self.SHUTDOWN_GRACE_PERIOD)
+            except subprocess.TimeoutExpired:
+                self.logger.info(f"Server process {pid_to_terminate} still running after {self.SHUTDOWN_GRACE_PERIOD:.0f}s. Repeating the shutdown signal.")
+                self._send_stop_signal(process_to_terminate)
+                process_to_terminate.wait(timeout=self.SHUTDOWN_SECOND_SIGNAL_PERIOD)
             self.logger.info(f"Server process {pid_to_terminate} exited gracefully.")
         except subprocess.TimeoutExpired:
-            self.logger.warning(f"Server process {pid_to_terminate} did not respond to graceful shutdown signal after 10s. Forcing termination (kill)...")
+            graceful_period = self.SHUTDOWN_GRACE_PERIOD + self.SHUTDOWN_SECOND_SIGNAL_PERIOD
+            self.logger.warning(f"Server process {pid_to_terminate} did not respond to graceful shutdown signals after {graceful_period:.0f}s. Forcing termination (kill)...")
             process_to_terminate.kill() # Force kill
             try:
-                process_to_terminate.wait(timeout=5) # Give kill some time
+                process_to_terminate.wait(timeout=self.SHUTDOWN_KILL_WAIT) # Give kill some time
                 self.logger.info(f"Server process {pid_to_terminate} force-killed.")
             except subprocess.TimeoutExpired:
-                self.logger.error(f"Server process {pid_to_terminate} did not terminate even after force kill and 5s wait.")
+                self.logger.error(f"Server process {pid_to_terminate} did not terminate even after force kill and {self.SHUTDOWN_KILL_WAIT:.0f}s wait.")
             except Exception as e_kill_wait:
                  self.logger.error(f"Error waiting for process {pid_to_terminate} after kill: {e_kill_wait}", exc_info=True)
         except Exception as e: # Catch other potential errors like process already dead
@@ -181,3 +368,22 @@ class ServerManager:
                     self.logger.error(f"Fallback kill failed for PID {pid_to_terminate}: {kill_e}", exc_info=True)
         finally:
             self.server_process = None # Clear the stored process
+            self.logger.info(f"Server shutdown took {time.monotonic() - shutdown_started:.2f}s.")
+
+    def _send_stop_signal(self, process: subprocess.Popen):
+        pid = process.pid
+        if platform.system() == "Windows":
+            self.logger.debug(f"Sending CTRL_BREAK_EVENT to process group {pid} (Windows).")
+            # This sends to the entire process group if CREATE_NEW_PROCESS_GROUP was used
+            os.kill(pid, signal.CTRL_BREAK_EVENT)
+            return
+        # On Linux/macOS, terminate the whole process group. start_server made the server a session
+        # leader, so the pgid is the pid and no racy os.getpgid() lookup is needed.
+        try:
+            self.logger.debug(f"Sending SIGTERM to process group {pid} (Unix-like).")
+            os.killpg(pid, signal.SIGTERM)
+        except ProcessLookupError: # Process might have died quickly
+            self.logger.info(f"Process {pid} not found for SIGTERM, likely already exited.")
+        except Exception as e_pg: # Catch other potential errors with killpg
+            self.logger.warning(f"Error sending SIGTERM to process group {pid}: {e_pg}. Falling back to direct SIGTERM.")
+            process.send_signal(signal.SIGTERM)
@@ -9,7 +9,8 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from comfy_launcher.config import Settings, get_all_current_settings # DOTENV_PATH is not needed in test file
+from comfy_launcher import config as config_module
+from comfy_launcher.config import Settings, get_all_current_settings, reload_settings # DOTENV_PATH is not needed in test file
 
 class TestConfig(unittest.TestCase):
 
@@ -69,38 +70,93 @@ LAUNCHER_THEME="dark"
             self.assertEqual(s.LAUNCHER_ROOT, expected_launcher_root)
             self.assertEqual(s.LOG_DIR, expected_log_dir)
 
+    def test_python_executable_is_probed_once(self):
+        """Test that PYTHON_EXECUTABLE only hits the filesystem on first access."""
+        with patch.dict(os.environ, {}, clear=True):
+            s = Settings(_env_file=Path("/path/to/absolutely/non_existent_dummy.env"))
+        with patch.object(Path, 'exists', return_value=False) as mock_exists:
+            first = s.PYTHON_EXECUTABLE
+            probe_count = mock_exists.call_count
+            second = s.PYTHON_EXECUTABLE
+        self.assertGreater(probe_count, 0)
+        self.assertEqual(mock_exists.call_count, probe_count)
+        self.assertIs(first, second)
+
+    def test_effective_connect_host_matches_host(self):
+        """Test that EFFECTIVE_CONNECT_HOST resolves to HOST and is stored on the instance after first access."""
+        with patch.dict(os.environ, {"HOST": "0.0.0.0"}, clear=True):
+            s = Settings(_env_file=Path("/path/to/absolutely/non_existent_dummy.env"))
+        self.assertEqual(s.EFFECTIVE_CONNECT_HOST, "0.0.0.0")
+        self.assertEqual(s.__dict__["EFFECTIVE_CONNECT_HOST"], "0.0.0.0")
+
+    def test_settings_built_lazily_on_first_access(self):
+        """Test that the shared settings instance is only constructed when first accessed."""
+        original_settings = config_module._settings
+        try:
+            config_module._settings = None
+            with patch.object(config_module, 'Settings', wraps=Settings) as mock_settings_class:
+                mock_settings_class.assert_not_called()
+                first = config_module.settings
+                second = config_module.settings
+            mock_settings_class.assert_called_once_with()
+            self.assertIs(first, second)
+        finally:
+            config_module._settings = original_settings
+
     def test_get_all_current_settings(self):
-        """Test the get_all_current_settings function."""
-        # Test with defaults by ensuring get_all_current_settings internally uses a non-existent .env
-        with patch.object(Settings, 'model_config', new={'env_file': Path("/path/to/non_existent_dummy.env"), 'extra': 'ignore'}), \
-             patch.dict(os.environ, {}, clear=True):
+        """Test that get_all_current_settings dumps the cached module-level settings instance."""
+        original_settings = config_module._settings
+        try:
+            # Test with defaults by reloading from a non-existent .env
+            with patch.object(Settings, 'model_config', new={'env_file': Path("/path/to/non_existent_dummy.env"), 'extra': 'ignore'}), \
+                 patch.dict(os.environ, {}, clear=True):
+                reload_settings()
             current_settings = get_all_current_settings()
             self.assertIsInstance(current_settings, dict)
             self.assertEqual(current_settings['DEBUG'], False)
             self.assertEqual(current_settings['PORT'], 8188)
 
-        # Test with a temporary .env override
-        env_content = "PORT=1234\nAPP_NAME=\"Test App via Env\"\n"
-        with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".env") as tmp_env:
-            tmp_env.write(env_content)
-            tmp_env_path_str = tmp_env.name
-        
-        try:
-            # To make get_all_current_settings use this temp .env, we patch Settings' model_config
-            # This is a bit more involved as get_all_current_settings creates its own Settings instance.
-            original_model_config = Settings.model_config
-
-            # Temporarily change the model_config for the Settings class itself
-            # so any new instance created by get_all_current_settings will use it.
-            Settings.model_config = {'env_file': Path(tmp_env_path_str), 'extra': 'ignore', 'env_file_encoding': 'utf-8'}
+            # Test with a temporary .env override
+            env_content = "PORT=1234\nAPP_NAME=\"Test App via Env\"\n"
+            with tempfile.NamedTemporaryFile(mode="w+", delete=False, suffix=".env") as tmp_env:
+                tmp_env.write(env_content)
+                tmp_env_path_str = tmp_env.name
 
-            with patch.dict(os.environ, {}, clear=True):
+            try:
+                with patch.object(Settings, 'model_config', new={'env_file': Path(tmp_env_path_str), 'extra': 'ignore', 'env_file_encoding': 'utf-8'}), \
+                     patch.dict(os.environ, {}, clear=True):
+                    # The .env is only read again on an explicit reload, not on every dump.
+                    self.assertEqual(get_all_current_settings()['PORT'], 8188)
+                    reload_settings()
                 current_settings_env = get_all_current_settings()
                 self.assertEqual(current_settings_env['PORT'], 1234)
                 self.assertEqual(current_settings_env['APP_NAME'], "Test App via Env")
+            finally:
+                os.unlink(tmp_env_path_str)
+        finally:
+            config_module._settings = original_settings # Restore the shared instance for other tests
+            config_module._settings_dump = None
+
+    def test_get_all_current_settings_dumps_once(self):
+        """Test that the settings dump is cached, returned as a copy, and recomputed after a reload."""
+        original_settings = config_module._settings
+        try:
+            with patch.dict(os.environ, {}, clear=True):
+                reload_settings()
+            with patch.object(Settings, 'model_dump', autospec=True, return_value={'PORT': 8188}) as mock_dump:
+                first = get_all_current_settings()
+                first['PORT'] = 1 # Mutating the returned dict must not leak into the cache
+                second = get_all_current_settings()
+                mock_dump.assert_called_once()
+                self.assertEqual(second['PORT'], 8188)
+
+                with patch.dict(os.environ, {}, clear=True):
+                    reload_settings()
+                get_all_current_settings()
+                self.assertEqual(mock_dump.call_count, 2)
         finally:
-            Settings.model_config = original_model_config # Restore original model_config
-            os.unlink(tmp_env_path_str)
+            config_module._settings = original_settings
+            config_module._settings_dump = None
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
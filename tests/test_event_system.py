@@ -53,6 +53,27 @@ class TestEventSystem(unittest.TestCase):
         self.mock_handler1.assert_not_called()
         self.mock_handler2.assert_called_once_with()
 
+    def test_unsubscribe_last_handler_leaves_empty_entry(self):
+        """Test that removing the last handler leaves an empty tuple, and every event type has an entry from the start."""
+        self.assertEqual(set(self.publisher._subscribers), set(AppEventType))
+        self.publisher.subscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler1)
+        self.publisher.unsubscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler1)
+        self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS)
+        self.mock_handler1.assert_not_called()
+        self.assertEqual(self.publisher._subscribers[AppEventType.TEST_EVENT_NO_ARGS], ())
+
+    def test_unsubscribe_during_publish_does_not_skip_handlers(self):
+        """Test that a handler unsubscribing itself mid-dispatch does not affect the in-flight publish."""
+        self.mock_handler1.side_effect = lambda: self.publisher.unsubscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler1)
+        self.publisher.subscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler1)
+        self.publisher.subscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler2)
+
+        self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS)
+        self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS)
+
+        self.mock_handler1.assert_called_once_with()
+        self.assertEqual(self.mock_handler2.call_count, 2)
+
     def test_unsubscribe_non_existent_handler(self):
         """Test unsubscribing a handler that was never subscribed (should not error)."""
         self.publisher.subscribe(AppEventType.TEST_EVENT_NO_ARGS, self.mock_handler1)
@@ -72,6 +93,13 @@ class TestEventSystem(unittest.TestCase):
         except Exception as e:
             self.fail(f"Publishing an event with no subscribers raised an exception: {e}")
 
+    @patch('comfy_launcher.event_system.event_system_logger', new_callable=MagicMock)
+    def test_publish_event_with_no_subscribers_skips_logging(self, mock_event_system_logger):
+        """Test that publishing with no subscribers returns before any logging work is done."""
+        self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS, data="test")
+        mock_event_system_logger.isEnabledFor.assert_not_called()
+        mock_event_system_logger.info.assert_not_called()
+
     @patch('comfy_launcher.event_system.event_system_logger', new_callable=MagicMock)
     def test_handler_raising_exception(self, mock_event_system_logger):
         """Test that if one handler raises an exception, others are still called and error is logged."""
@@ -92,6 +120,33 @@ class TestEventSystem(unittest.TestCase):
         self.assertIn(f"Error in handler '{self.mock_handler1.__name__}' for event '{AppEventType.TEST_EVENT_WITH_ARGS.name}'", log_message)
         self.assertIn(error_message, log_message) # The exception string 'e' is part of the log message
 
+    def test_subscribe_unknown_event_type_raises(self):
+        """Test that subscribing to something that is not an AppEventType is rejected."""
+        with self.assertRaises(ValueError):
+            self.publisher.subscribe("TEST_EVENT_NO_ARGS", self.mock_handler1)
+        self.assertNotIn("TEST_EVENT_NO_ARGS", self.publisher._subscribers)
+
+    def test_subscriptions_context_unsubscribes_on_exit(self):
+        """Test that handlers subscribed via subscriptions() are removed when the block exits, even on error."""
+        handlers = {AppEventType.TEST_EVENT_NO_ARGS: self.mock_handler1, AppEventType.TEST_EVENT_WITH_ARGS: self.mock_handler2}
+        with self.assertRaises(RuntimeError):
+            with self.publisher.subscriptions(handlers):
+                self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS)
+                self.publisher.publish(AppEventType.TEST_EVENT_WITH_ARGS, value=1)
+                raise RuntimeError("body failed")
+
+        self.publisher.publish(AppEventType.TEST_EVENT_NO_ARGS)
+        self.mock_handler1.assert_called_once_with()
+        self.mock_handler2.assert_called_once_with(value=1)
+        self.assertEqual(self.publisher._subscribers[AppEventType.TEST_EVENT_NO_ARGS], ())
+        self.assertEqual(self.publisher._subscribers[AppEventType.TEST_EVENT_WITH_ARGS], ())
+
+    def test_subscribe_many_with_unknown_type_subscribes_nothing(self):
+        """Test that one invalid event type rejects the whole batch."""
+        with self.assertRaises(ValueError):
+            self.publisher.subscribe_many({AppEventType.TEST_EVENT_NO_ARGS: self.mock_handler1, "NOT_AN_EVENT": self.mock_handler2})
+        self.assertEqual(self.publisher._subscribers[AppEventType.TEST_EVENT_NO_ARGS], ())
+
     def test_subscribe_same_handler_multiple_times(self):
         """Test that subscribing the same handler multiple times for the same event results in it being called once."""
         # The current implementation will add it multiple times and call it multiple times.
@@ -5,12 +5,16 @@ import threading
 import time 
 import platform # For mocking platform.system() in new tests
 import subprocess # For mocking subprocess.run and its exceptions
+import tempfile
+import os
+import json
 
 import sys
 project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from comfy_launcher import gui_manager as gui_manager_module
 from comfy_launcher.gui_manager import GUIManager
 from comfy_launcher.config import settings # Using the actual settings object
 from comfy_launcher.event_system import AppEventType # For testing event publishing
@@ -38,6 +42,9 @@ class TestGuiManager(unittest.TestCase):
             logger=self.mock_logger,
             server_manager=self.mock_server_manager
         )
+        # Let the pywebview pre-warm thread finish so its log call cannot land in a test's logger assertions
+        self.gui_manager._backend_prewarm_thread.join(timeout=10)
+        self.mock_logger.reset_mock()
         # self.gui_manager.webview_window will be set by prepare_and_launch_gui
         # and will be a mock returned by mock_webview_module.create_window
 
@@ -83,9 +90,11 @@ class TestGuiManager(unittest.TestCase):
                 mock_get_asset_content_method.reset_mock()
                 mock_get_asset_content_method.side_effect = get_asset_side_effect # Re-assign side effect
                 mock_get_system_theme.reset_mock() # Reset for calls within _prepare_loading_html
+                self.gui_manager._system_theme = None # Forget the OS theme detected in the previous scenario
                 mock_get_system_theme.return_value = system_theme_return # Re-assign for this sub-test
 
-                with patch('builtins.open', mock_open()) as mock_file_write:
+                with patch('builtins.open', mock_open()) as mock_file_write, \
+                     patch('comfy_launcher.gui_manager.os.replace') as mock_os_replace:
                     html_string_result = self.gui_manager._prepare_loading_html()
 
                 mock_get_asset_content_method.assert_any_call("loading_base.html")
@@ -109,7 +118,61 @@ class TestGuiManager(unittest.TestCase):
                     mock_get_system_theme.assert_not_called() # Should not be called if theme is explicit
                 
                 expected_written_path = self.gui_manager.assets_dir.parent / "loading_generated.html"
-                mock_file_write.assert_called_once_with(expected_written_path, "w", encoding="utf-8")
+                expected_temp_path = expected_written_path.with_name(f"loading_generated.html.{os.getpid()}.tmp")
+                mock_file_write.assert_any_call(expected_temp_path, "w", encoding="utf-8") # The previous file is read first to check its cache key
+                mock_os_replace.assert_called_once_with(expected_temp_path, expected_written_path)
+
+    @patch('comfy_launcher.gui_manager.GUIManager._get_asset_content')
+    @patch('comfy_launcher.gui_manager.settings')
+    def test_prepare_loading_html_fills_template_in_one_pass(self, mock_settings_gui, mock_get_asset_content_method):
+        mock_settings_gui.LAUNCHER_THEME = "dark"
+        mock_get_asset_content_method.side_effect = lambda relative_path, is_critical_fallback=False: {
+            "loading_base.html": '<html class="{THEME_CLASS}"><style>{CSS_CONTENT}</style><script>{JS_CONTENT}</script></html>',
+            "loading.js": "const literal = '{THEME_CLASS}';", # Placeholder text inside inserted content must survive
+        }.get(relative_path, "")
+
+        with patch('builtins.open', mock_open()):
+            html_string_result = self.gui_manager._prepare_loading_html()
+
+        self.assertIn('<html class="dark">', html_string_result)
+        self.assertIn("const literal = '{THEME_CLASS}';", html_string_result)
+        self.assertNotIn("{CSS_CONTENT}", html_string_result)
+
+    @patch('comfy_launcher.gui_manager.settings')
+    def test_prepare_loading_html_reuses_generated_file_when_inputs_unchanged(self, mock_settings_gui):
+        mock_settings_gui.LAUNCHER_THEME = "dark"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            assets_dir = Path(tmp_dir) / "assets"
+            assets_dir.mkdir()
+            (assets_dir / "loading_base.html").write_text('<html><body class="{THEME_CLASS}"><style>{CSS_CONTENT}</style><script>{JS_CONTENT}</script></body></html>', encoding="utf-8")
+            (assets_dir / "loading.js").write_text("window.test_js_loaded = true;", encoding="utf-8")
+            self.gui_manager.assets_dir = assets_dir
+
+            first_result = self.gui_manager._prepare_loading_html()
+            with patch.object(GUIManager, '_get_asset_content') as mock_get_asset_content:
+                second_result = self.gui_manager._prepare_loading_html()
+                mock_get_asset_content.assert_not_called() # Served from loading_generated.html
+            self.assertEqual(first_result, second_result)
+            self.assertIn('class="dark"', second_result)
+            self.assertEqual([p.name for p in Path(tmp_dir).iterdir() if p.name.endswith(".tmp")], []) # Temp file swapped in, not left behind
+
+            # A different theme is a different cache key, so the page is regenerated
+            mock_settings_gui.LAUNCHER_THEME = "light"
+            third_result = self.gui_manager._prepare_loading_html()
+            self.assertIn('class="light"', third_result)
+
+    def test_theme_query_command_uses_full_program_path(self):
+        with patch('comfy_launcher.gui_manager.shutil.which', return_value="/usr/bin/gdbus"):
+            self.assertEqual(gui_manager_module._theme_query_command("gdbus", "call"), ["/usr/bin/gdbus", "call"])
+
+    @patch('comfy_launcher.gui_manager._webview_module')
+    def test_init_prewarms_only_pywebview(self, mock_webview_module):
+        gui_manager = GUIManager(
+            app_name="Test", window_width=800, window_height=600, connect_host="127.0.0.1", port=8188,
+            assets_dir=self.current_settings.ASSETS_DIR, logger=self.mock_logger, server_manager=self.mock_server_manager
+        )
+        gui_manager._backend_prewarm_thread.join(timeout=5)
+        mock_webview_module.assert_called_once_with() # The platform backend is left for webview.start() to import
 
     @patch('comfy_launcher.gui_manager.platform.system')
     @patch('comfy_launcher.gui_manager.winreg', create=True) # create=True because winreg might be None in SUT
@@ -122,9 +185,10 @@ class TestGuiManager(unittest.TestCase):
         mock_winreg.OpenKey.return_value = mock_key
         mock_winreg.QueryValueEx.return_value = (0, None) # 0 for AppsUseLightTheme means dark
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "dark")
-        mock_winreg.ConnectRegistry.assert_called_once_with(None, mock_winreg.HKEY_CURRENT_USER)
-        mock_winreg.OpenKey.assert_called_once_with(mock_winreg.ConnectRegistry.return_value, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
-        mock_winreg.CloseKey.assert_called_once_with(mock_key)
+        mock_winreg.ConnectRegistry.assert_not_called()
+        mock_winreg.OpenKey.assert_called_once_with(mock_winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Themes\Personalize")
+        mock_winreg.QueryValueEx.assert_called_once_with(mock_key.__enter__.return_value, "AppsUseLightTheme")
+        mock_key.__exit__.assert_called_once() # Key handle closed by the with block
 
 
         # Test Windows Light Mode
@@ -148,9 +212,11 @@ class TestGuiManager(unittest.TestCase):
              self.mock_logger.debug.assert_any_call("winreg module not available for Windows theme detection.")
 
 
+    @patch('comfy_launcher.gui_manager.shutil.which', return_value=None) # Not on PATH: the bare name is used
     @patch('comfy_launcher.gui_manager.platform.system', return_value="Darwin") # macOS
     @patch('comfy_launcher.gui_manager.subprocess.run')
-    def test_get_system_theme_preference_macos(self, mock_subprocess_run, mock_platform_system):
+    @patch.object(GUIManager, '_read_macos_theme_natively', return_value=None) # PyObjC unavailable: CLI fallback
+    def test_get_system_theme_preference_macos(self, mock_native_theme, mock_subprocess_run, mock_platform_system, mock_which):
         # Test macOS Dark Mode
         mock_process_dark = MagicMock()
         mock_process_dark.returncode = 0
@@ -159,7 +225,7 @@ class TestGuiManager(unittest.TestCase):
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "dark")
         mock_subprocess_run.assert_called_once_with(
             ["defaults", "read", "-g", "AppleInterfaceStyle"],
-            capture_output=True, text=True, check=False, timeout=2
+            check=False, capture_output=True, text=True, timeout=0.5, stdin=subprocess.DEVNULL, close_fds=False
         )
 
         # Test macOS Light Mode (key not found or different value)
@@ -182,9 +248,11 @@ class TestGuiManager(unittest.TestCase):
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "light")
         self.mock_logger.error.assert_any_call(f"Error detecting macOS theme: {subprocess.TimeoutExpired('defaults', 2)}.", exc_info=True)
 
+    @patch('comfy_launcher.gui_manager.shutil.which', return_value=None)
     @patch('comfy_launcher.gui_manager.platform.system', return_value="Linux")
     @patch('comfy_launcher.gui_manager.subprocess.run')
-    def test_get_system_theme_preference_linux(self, mock_subprocess_run, mock_platform_system):
+    @patch.object(GUIManager, '_read_linux_theme_natively', return_value=None) # PyGObject unavailable: CLI fallback
+    def test_get_system_theme_preference_linux(self, mock_native_theme, mock_subprocess_run, mock_platform_system, mock_which):
         expected_xdg_cmd = [
             "gdbus", "call", "--session",
             "--dest", "org.freedesktop.portal.Desktop",
@@ -200,7 +268,7 @@ class TestGuiManager(unittest.TestCase):
         mock_subprocess_run.return_value = mock_process_xdg_dark
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "dark")
         mock_subprocess_run.assert_called_once_with(
-            expected_xdg_cmd, capture_output=True, text=True, check=True, timeout=2
+            expected_xdg_cmd, check=True, capture_output=True, text=True, timeout=0.5, stdin=subprocess.DEVNULL, close_fds=False
         )
 
         # Test Linux Light Mode via XDG Portal
@@ -223,15 +291,55 @@ class TestGuiManager(unittest.TestCase):
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "light")
         self.mock_logger.info.assert_any_call(f"XDG Portal for Linux theme failed: {subprocess.CalledProcessError(1, expected_xdg_cmd)}.")
 
+    @patch('comfy_launcher.gui_manager.subprocess.run')
+    def test_get_system_theme_preference_prefers_native_apis(self, mock_subprocess_run):
+        for system_os, native_method in (("Darwin", '_read_macos_theme_natively'), ("Linux", '_read_linux_theme_natively')):
+            with self.subTest(os=system_os), \
+                 patch('comfy_launcher.gui_manager.platform.system', return_value=system_os), \
+                 patch.object(GUIManager, native_method, return_value="dark"):
+                self.assertEqual(self.gui_manager._get_system_theme_preference(), "dark")
+        mock_subprocess_run.assert_not_called() # No process is spawned when the in-process API answers
+
+    @patch('comfy_launcher.gui_manager.GUIManager._get_system_theme_preference', return_value="dark")
+    @patch('comfy_launcher.gui_manager.settings')
+    def test_resolve_theme_detects_system_theme_once(self, mock_settings_gui, mock_get_system_theme):
+        mock_settings_gui.LAUNCHER_THEME = "system"
+        self.assertEqual(self.gui_manager._resolve_theme(), "dark")
+        self.assertEqual(self.gui_manager._resolve_theme(), "dark")
+        mock_get_system_theme.assert_called_once()
+
+        mock_settings_gui.LAUNCHER_THEME = "light" # An explicit theme always wins
+        self.assertEqual(self.gui_manager._resolve_theme(), "light")
+
     @patch('comfy_launcher.gui_manager.platform.system', return_value="Solaris") # Unknown OS
     def test_get_system_theme_preference_unknown_os(self, mock_platform_system):
         self.assertEqual(self.gui_manager._get_system_theme_preference(), "light")
         self.mock_logger.info.assert_any_call("System theme detection not implemented for OS 'Solaris'.")
 
     
+    @patch('comfy_launcher.gui_manager.webview')
+    def test_prepare_and_launch_gui_loads_react_app_by_url(self, mock_webview_module):
+        self.gui_manager._prepare_loading_html = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.gui_manager.web_dist_dir = Path(tmp_dir)
+            (Path(tmp_dir) / "index.html").write_text("<html></html>", encoding="utf-8")
+
+            self.gui_manager.prepare_and_launch_gui()
+
+        self.gui_manager._prepare_loading_html.assert_not_called()
+        mock_webview_module.create_window.assert_called_once_with(
+            self.gui_manager.app_name,
+            url=(Path(tmp_dir) / "index.html").as_uri(),
+            width=self.gui_manager.window_width,
+            height=self.gui_manager.window_height,
+            resizable=True,
+            confirm_close=False
+        )
+
     @patch('comfy_launcher.gui_manager.webview')
     def test_prepare_and_launch_gui_creates_window(self, mock_webview_module):
         self.gui_manager._prepare_loading_html = MagicMock(return_value="<html>Mocked Content</html>")
+        self.gui_manager.web_dist_dir = Path("/path/to/absolutely/non_existent_web_dist") # No React build: legacy loading page
         
         mock_window_instance = MagicMock(name="MockWindowInstance")
         
@@ -280,7 +388,17 @@ class TestGuiManager(unittest.TestCase):
         self.gui_manager.on_loaded()
 
         self.assertTrue(self.gui_manager.is_window_loaded.is_set())
-        self.mock_logger.debug.assert_any_call("Initial window content loaded. Publishing GUI_WINDOW_CONTENT_LOADED event.")
+        self.mock_logger.debug.assert_any_call("Initial React app loaded. Publishing GUI_WINDOW_CONTENT_LOADED event.")
+
+    @patch('comfy_launcher.gui_manager.event_publisher.publish')
+    def test_on_loaded_first_time_skips_url_lookup(self, mock_event_publish):
+        self.gui_manager.webview_window = MagicMock()
+        self.gui_manager.set_theme = MagicMock()
+
+        self.gui_manager.on_loaded()
+
+        self.gui_manager.webview_window.get_current_url.assert_not_called()
+        mock_event_publish.assert_called_once_with(AppEventType.GUI_WINDOW_CONTENT_LOADED)
 
     def test_on_loaded_subsequent_times_settings_page(self):
         self.gui_manager.is_window_loaded.set() 
@@ -300,15 +418,62 @@ class TestGuiManager(unittest.TestCase):
     def test_set_status_calls_execute_js(self):
         self.gui_manager.webview_window = MagicMock() 
         self.gui_manager._execute_js = MagicMock() 
+        self.gui_manager.is_window_loaded.set()
         test_message = "Test Status Update"
         
         self.gui_manager.set_status(test_message)
+        self.gui_manager._status_flush_timer.join(timeout=5)
         
-        escaped_message = test_message.replace("\\", "\\\\").replace("'", "\\'")
         self.gui_manager._execute_js.assert_called_once_with(
-            f"if(typeof window.updateStatus === 'function') window.updateStatus('{escaped_message}');"
+            "if(typeof window.updateStatus === 'function') window.updateStatus(\"Test Status Update\");"
+        )
+
+    def test_set_status_coalesces_rapid_updates(self):
+        self.gui_manager._execute_js = MagicMock()
+        self.gui_manager.STATUS_COALESCE_WINDOW = 0.2
+        self.gui_manager.is_window_loaded.set()
+
+        self.gui_manager.set_status("Initializing...")
+        flush_timer = self.gui_manager._status_flush_timer
+        self.gui_manager.set_status("Starting ComfyUI server process...")
+        self.assertIs(self.gui_manager._status_flush_timer, flush_timer) # No second flush scheduled
+        flush_timer.join(timeout=5)
+
+        self.gui_manager._execute_js.assert_called_once_with(
+            "if(typeof window.updateStatus === 'function') window.updateStatus(\"Starting ComfyUI server process...\");"
+        )
+
+    def test_set_status_before_load_is_held_until_loaded(self):
+        self.gui_manager._execute_js = MagicMock()
+        self.gui_manager.STATUS_COALESCE_WINDOW = 0
+
+        self.gui_manager.set_status("Initializing...")
+        self.gui_manager._status_flush_timer.join(timeout=5)
+        self.gui_manager.set_status("Starting ComfyUI server process...")
+        self.gui_manager._status_flush_timer.join(timeout=5)
+        self.gui_manager._execute_js.assert_not_called() # Page not loaded yet
+
+        with patch('comfy_launcher.gui_manager.event_publisher.publish'), patch.object(self.gui_manager, 'set_theme'):
+            self.gui_manager.on_loaded()
+
+        self.gui_manager._execute_js.assert_called_once_with(
+            "if(typeof window.updateStatus === 'function') window.updateStatus(\"Starting ComfyUI server process...\");"
         )
 
+    def test_error_pages_quote_message_as_js_string_literal(self):
+        self.gui_manager._execute_js = MagicMock()
+        tricky_message = "Path C:\\temp isn't \"ok\"\nline\u2028two"
+
+        self.gui_manager.load_error_page(tricky_message)
+        self.gui_manager.load_critical_error_page(tricky_message)
+
+        for call_args, function_name in zip(self.gui_manager._execute_js.call_args_list, ("showError", "showCriticalError")):
+            js_code = call_args[0][0]
+            js_literal = js_code[js_code.rindex(f"window.{function_name}(") + len(f"window.{function_name}("):-2]
+            self.assertEqual(json.loads(js_literal), tricky_message) # Round-trips exactly
+            self.assertNotIn("\n", js_literal)
+            self.assertNotIn("\u2028", js_literal)
+
     @patch('comfy_launcher.gui_manager.webview')
     def test_start_webview_blocking_calls_webview_start(self, mock_webview_module):
         self.gui_manager.webview_window = MagicMock() 
@@ -420,48 +585,103 @@ class TestGuiManager(unittest.TestCase):
         mock_event_publish.assert_not_called() # Should not relay if no window
         self.mock_logger.warning.assert_any_call("Event Handler: Received SHOW_WINDOW_REQUEST, but webview_window is None. Cannot show.")
 
-    @patch('comfy_launcher.gui_manager.time.sleep', return_value=None) # Mock sleep to speed up test
-    def test_redirect_loop_server_available_redirects_and_sets_status(self, mock_sleep):
+    def test_handle_server_ready_redirects_and_sets_status(self):
+        self.gui_manager.FADE_OUT_REDIRECT_DELAY = 0 # Skip the fade-out wait for the test
         self.gui_manager.webview_window = MagicMock()
         self.gui_manager.webview_window.load_url = MagicMock()
-        self.gui_manager.set_status = MagicMock()
-        self.mock_server_manager.wait_for_server_availability.return_value = True
-        
-        mock_redirect_stop_event = threading.Event()
-        mock_shutdown_event = threading.Event()
+        self.gui_manager._execute_js_batch = MagicMock()
+        self.gui_manager.start_server_ready_deadline()
+        deadline_timer = self.gui_manager._server_ready_deadline
 
-        # To exit the loop after one successful iteration
-        self.gui_manager.webview_window.load_url.side_effect = lambda url: mock_redirect_stop_event.set()
+        self.gui_manager.handle_server_ready()
+        self.gui_manager._redirect_timer.join(timeout=5)
 
-        self.gui_manager.redirect_when_ready_loop(mock_redirect_stop_event, mock_shutdown_event)
-
-        # The SUT calls wait_for_server_availability with specific retries/delay now
-        self.mock_server_manager.wait_for_server_availability.assert_called_once_with(retries=1, delay=0.1)
+        self.assertTrue(deadline_timer.finished.is_set()) # Timer.cancel() sets `finished`, so the deadline never fires
+        self.assertIsNone(self.gui_manager._server_ready_deadline)
+        self.mock_server_manager.check_server_ready.assert_not_called() # No polling from the GUI side
         self.gui_manager.webview_window.load_url.assert_called_once_with(f"http://{self.gui_manager.connect_host}:{self.gui_manager.port}")
-        self.gui_manager.set_status.assert_called_with("Connected to ComfyUI.")
-        self.mock_logger.info.assert_any_call(f"Redirect loop: Server is available. Attempting to redirect webview to http://{self.gui_manager.connect_host}:{self.gui_manager.port}")
+        # The status update and the fade-out go to the webview in a single batched call
+        self.gui_manager._execute_js_batch.assert_called_once_with([
+            "if(typeof window.updateStatus === 'function') window.updateStatus(\"Connected to ComfyUI.\");",
+            "if(typeof window.fadeOutLoading === 'function') window.fadeOutLoading();"
+        ])
+        self.mock_logger.info.assert_any_call(f"Event Handler: Received SERVER_READY. Attempting to redirect webview to http://{self.gui_manager.connect_host}:{self.gui_manager.port}")
+
+    def test_handle_server_ready_skips_redirect_when_quitting(self):
+        self.gui_manager.FADE_OUT_REDIRECT_DELAY = 0.05
+        self.gui_manager.webview_window = MagicMock()
+        self.gui_manager.handle_server_ready()
+        self.gui_manager.application_is_quitting = True # Quit arrives during the fade-out
+        self.gui_manager._redirect_timer.join(timeout=5)
+        self.gui_manager.webview_window.load_url.assert_not_called()
+
+    def test_quit_request_cancels_pending_redirect(self):
+        self.gui_manager.FADE_OUT_REDIRECT_DELAY = 5
+        mock_window = self.gui_manager.webview_window = MagicMock()
+        self.gui_manager.handle_server_ready()
+        redirect_timer = self.gui_manager._redirect_timer
+
+        self.gui_manager.handle_application_quit_request()
+        redirect_timer.join(timeout=1)
+
+        self.assertFalse(redirect_timer.is_alive()) # Returned at once instead of sitting out the fade-out delay
+        mock_window.load_url.assert_not_called()
+
+    @patch('comfy_launcher.__main__.app_shutdown_event')
+    def test_server_stopped_cancels_pending_redirect(self, mock_app_shutdown_event):
+        mock_app_shutdown_event.is_set.return_value = False
+        self.gui_manager.FADE_OUT_REDIRECT_DELAY = 5
+        mock_window = self.gui_manager.webview_window = MagicMock()
+        self.gui_manager.load_error_page = MagicMock()
+        self.gui_manager.handle_server_ready()
+        redirect_timer = self.gui_manager._redirect_timer
+
+        self.gui_manager.handle_server_stopped_unexpectedly_event(pid=123, returncode=1) # Server dies during the fade-out
+        redirect_timer.join(timeout=1)
+
+        self.assertFalse(redirect_timer.is_alive())
+        self.assertIsNone(self.gui_manager._redirect_timer)
+        self.gui_manager.load_error_page.assert_called_once()
+        mock_window.load_url.assert_not_called() # The error page is not replaced by a refused connection
 
-    @patch('comfy_launcher.gui_manager.time.sleep', return_value=None)
     @patch.object(GUIManager, 'load_error_page') # Patch the method
-    def test_redirect_loop_server_timeout_sets_error_status(self, mock_load_error_page, mock_sleep):
+    def test_server_ready_deadline_expiry_sets_error_status(self, mock_load_error_page):
         self.gui_manager.webview_window = MagicMock()
-        self.gui_manager.webview_window.load_url = MagicMock()
-        self.gui_manager.set_status = MagicMock()
-        self.mock_server_manager.wait_for_server_availability.return_value = False # Simulate timeout
+        self.gui_manager.SERVER_READY_MAX_WAIT_TIME = 0.01 # Force quick timeout for test
+
+        self.gui_manager.start_server_ready_deadline()
+        self.gui_manager._server_ready_deadline.join(timeout=5)
 
-        mock_redirect_stop_event = threading.Event()
-        mock_shutdown_event = threading.Event()
+        self.gui_manager.webview_window.load_url.assert_not_called()
+        mock_load_error_page.assert_called_once_with("ComfyUI server did not become available in time. Please check server logs.")
+        self.mock_logger.warning.assert_any_call("Max wait time exceeded for server availability.")
 
-        # To exit the loop after one failed iteration
-        # The loop now has a max_wait_time, so we can let it timeout naturally or force stop_event
-        self.gui_manager.REDIRECT_LOOP_MAX_WAIT_TIME = 0.1 # Force quick timeout for test
-        # self.mock_server_manager.wait_for_server_availability.side_effect = lambda **kwargs: mock_redirect_stop_event.set() or False
+    @patch.object(GUIManager, 'load_error_page')
+    def test_quit_request_cancels_server_ready_deadline(self, mock_load_error_page):
+        self.gui_manager.SERVER_READY_MAX_WAIT_TIME = 0.05
+        self.gui_manager.start_server_ready_deadline()
+        deadline_timer = self.gui_manager._server_ready_deadline
 
-        self.gui_manager.redirect_when_ready_loop(mock_redirect_stop_event, mock_shutdown_event)
+        self.gui_manager.handle_application_quit_request()
+        deadline_timer.join(timeout=5)
 
-        self.gui_manager.webview_window.load_url.assert_not_called()
-        mock_load_error_page.assert_called_with("ComfyUI server did not become available in time. Please check server logs.")
-        self.mock_logger.warning.assert_any_call("Redirect loop: Max wait time exceeded for server availability.")
+        mock_load_error_page.assert_not_called()
+
+    def test_get_asset_content_rereads_only_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.gui_manager.assets_dir = Path(tmp_dir)
+            asset_path = Path(tmp_dir) / "loading.js"
+            asset_path.write_text("first", encoding="utf-8")
+            os.utime(asset_path, ns=(1_000_000_000, 1_000_000_000))
+
+            self.assertEqual(self.gui_manager._get_asset_content("loading.js"), "first")
+            with patch.object(Path, 'read_bytes') as mock_read_bytes:
+                self.assertEqual(self.gui_manager._get_asset_content("loading.js"), "first")
+                mock_read_bytes.assert_not_called() # Served from memory
+
+            asset_path.write_text("second", encoding="utf-8")
+            os.utime(asset_path, ns=(2_000_000_000, 2_000_000_000))
+            self.assertEqual(self.gui_manager._get_asset_content("loading.js"), "second")
 
     def test_get_asset_content_file_not_found_non_critical(self):
         # Mock assets_dir to control path resolution
@@ -492,6 +712,11 @@ class TestGuiManager(unittest.TestCase):
         self.mock_logger.error.assert_any_call(f"Asset file not found: {mock_non_existent_path}")
         self.mock_logger.critical.assert_any_call(f"Critical asset 'critical_asset.html' not found, and no fallback content available other than the hardcoded one.")
 
+    def test_execute_js_batch_uses_single_evaluate_js_call(self):
+        self.gui_manager.webview_window = MagicMock()
+        self.gui_manager._execute_js_batch(["first();", "second();"])
+        self.gui_manager.webview_window.evaluate_js.assert_called_once_with("first();;second();")
+
     def test_execute_js_no_window(self):
         self.gui_manager.webview_window = None
         self.gui_manager._execute_js("console.log('test');")
@@ -58,7 +58,8 @@ class TestLogManager(unittest.TestCase):
         mock_perform_rotation.assert_called_once()
         self.mock_get_logger.assert_called_with("ComfyUILauncher")
         self.mock_logger_instance.setLevel.assert_called_with(logging.DEBUG)
-        self.assertGreaterEqual(self.mock_logger_instance.addHandler.call_count, 2)
+        self.mock_logger_instance.addHandler.assert_called_once()
+        self.assertIsInstance(self.mock_logger_instance.addHandler.call_args[0][0], logging.handlers.QueueHandler)
         self.assertTrue(self.log_dir.exists())
         self.assertTrue(self.archive_dir.exists())
 
@@ -80,10 +81,50 @@ class TestLogManager(unittest.TestCase):
         self.mock_logger_instance.removeHandler.assert_has_calls(
             [call(mock_handler1), call(mock_handler2)], any_order=True
         )
-        self.assertGreaterEqual(self.mock_logger_instance.addHandler.call_count, 2)
+        self.mock_logger_instance.addHandler.assert_called_once()
         self.assertEqual(logger, self.mock_logger_instance)
         self.assertEqual(log_manager_again.get_launcher_logger(), self.mock_logger_instance)
+        log_manager.shutdown()
+        log_manager_again.shutdown()
 
+    @patch('comfy_launcher.log_manager.LogManager._perform_log_rotation_and_cleanup')
+    def test_queued_records_are_written_by_listener(self, mock_perform_rotation):
+        log_manager = LogManager(
+            log_dir=self.log_dir, debug_mode=False,
+            max_files_to_keep_in_archive=3, max_log_age_days=5
+        )
+        queue_handler = self.mock_logger_instance.addHandler.call_args[0][0]
+        real_handlers = log_manager._log_listener.handlers
+        record = logging.LogRecord("ComfyUILauncher", logging.INFO, __file__, 1, "queued %s", ("message",), None)
+
+        queue_handler.handle(record)
+        log_manager.shutdown() # Drains the queue before returning
+        for handler in real_handlers:
+            handler.close()
+
+        self.assertIn("queued message", (self.log_dir / "launcher.log").read_text(encoding="utf-8"))
+        self.assertIsNone(log_manager._log_listener)
+
+
+    @patch('comfy_launcher.log_manager.LogManager._perform_log_rotation_and_cleanup')
+    def test_shutdown_attaches_handlers_directly(self, mock_perform_rotation):
+        log_manager = LogManager(
+            log_dir=self.log_dir, debug_mode=False,
+            max_files_to_keep_in_archive=3, max_log_age_days=5
+        )
+        queue_handler = self.mock_logger_instance.addHandler.call_args[0][0]
+        real_handlers = log_manager._log_listener.handlers
+        self.mock_logger_instance.handlers = [queue_handler]
+        self.mock_logger_instance.addHandler.reset_mock()
+
+        log_manager.shutdown()
+        for handler in real_handlers:
+            handler.close()
+
+        # Records logged after shutdown (e.g. a crash during teardown) go straight to the console and file
+        self.mock_logger_instance.removeHandler.assert_called_once_with(queue_handler)
+        self.mock_logger_instance.addHandler.assert_has_calls([call(handler) for handler in real_handlers])
+        self.assertIsNone(log_manager._log_listener)
 
     @patch('comfy_launcher.log_manager.LogManager._perform_log_rotation_and_cleanup')
     def test_log_manager_initialization_production_mode(self, mock_perform_rotation):
@@ -96,6 +137,7 @@ class TestLogManager(unittest.TestCase):
             max_files_to_keep_in_archive=3, max_log_age_days=5
         )
         logger = log_manager.get_launcher_logger()
+        log_manager.shutdown()
 
         mock_perform_rotation.assert_called_once()
         self.mock_get_logger.assert_called_with("ComfyUILauncher")
@@ -103,9 +145,9 @@ class TestLogManager(unittest.TestCase):
         self.assertEqual(logger, self.mock_logger_instance)
 
     @patch('comfy_launcher.log_manager.datetime')
-    @patch('comfy_launcher.log_manager.os.rename')
+    @patch('comfy_launcher.log_manager.os.replace')
     @patch('comfy_launcher.log_manager.LogManager._perform_log_rotation_and_cleanup') # Mock this out for focused test
-    def test_internal_rotate_log_file(self, mock_perform_rotation, mock_os_rename, mock_datetime_module):
+    def test_internal_rotate_log_file(self, mock_perform_rotation, mock_os_replace, mock_datetime_module):
         mock_file_mtime = datetime(2023, 1, 1, 12, 0, 0)
         mock_datetime_module.fromtimestamp.return_value = mock_file_mtime
 
@@ -124,14 +166,12 @@ class TestLogManager(unittest.TestCase):
         expected_rotated_name = f"test_{mock_file_mtime.strftime('%Y-%m-%d_%H-%M-%S')}.log"
         expected_target_path = self.archive_dir / expected_rotated_name
         
-        mock_os_rename.assert_called_once_with(log_file_to_rotate, expected_target_path)
+        mock_os_replace.assert_called_once_with(log_file_to_rotate, expected_target_path)
         mock_perform_rotation.assert_called_once() # From __init__
 
-    @patch('comfy_launcher.log_manager.os.rename')
+    @patch('comfy_launcher.log_manager.os.replace')
     @patch('comfy_launcher.log_manager.datetime')
-    # Patch Path.exists specifically where it's used in _rotate_log_file
-    @patch('comfy_launcher.log_manager.Path.exists')
-    def test_internal_rotate_log_file_with_counter(self, mock_path_exists, mock_datetime_module, mock_os_rename):
+    def test_internal_rotate_log_file_with_counter(self, mock_datetime_module, mock_os_replace):
         # Setup LogManager instance (mocking out __init__'s _perform_log_rotation_and_cleanup)
         with patch.object(LogManager, '_perform_log_rotation_and_cleanup'):
             log_manager = LogManager(
@@ -154,21 +194,13 @@ class TestLogManager(unittest.TestCase):
         archive_path_counter1 = self.archive_dir / f"{base_archive_name_no_ext}_1{ext}"
         archive_path_counter2 = self.archive_dir / f"{base_archive_name_no_ext}_2{ext}"
 
-        # Sequence of Path.exists() calls in _rotate_log_file for "test.log":
-        # 1. On log_file_to_rotate (source file) - should exist
-        # 2. On archive_path_original (e.g., test_YYYY-MM-DD_HH-MM-SS.log) - simulate exists
-        # 3. On archive_path_counter1 (e.g., test_YYYY-MM-DD_HH-MM-SS_1.log) - simulate exists
-        # 4. On archive_path_counter2 (e.g., test_YYYY-MM-DD_HH-MM-SS_2.log) - simulate NOT exists (this one is chosen)
-        # The mock_path_exists is for all Path.exists calls.
-        # The first call in _rotate_log_file is `if log_file.exists():`
-        # Then in the loop: `while archive_path.exists():`
-        # So, the side_effect should cover these calls in order.
-        # For this specific test, we are interested in the archive path checks.
-        mock_path_exists.side_effect = [True, True, True, False] # Source exists, archive_original exists, archive_counter1 exists, archive_counter2 does NOT exist
+        # The original name and the _1 suffix are already taken in the archive, so _2 is the first free name.
+        archive_path_original.write_text("older rotation")
+        archive_path_counter1.write_text("older rotation")
 
         log_manager._rotate_log_file("test.log", mock_logger)
 
-        mock_os_rename.assert_called_once_with(log_file_to_rotate, archive_path_counter2)
+        mock_os_replace.assert_called_once_with(log_file_to_rotate, archive_path_counter2)
         mock_logger.info.assert_any_call(f"Rotated previous log 'test.log' to archive as '{archive_path_counter2.name}'")
 
     @patch('comfy_launcher.log_manager.datetime') # This mock_datetime_module is for the SUT
@@ -194,6 +226,7 @@ class TestLogManager(unittest.TestCase):
             max_files_to_keep_in_archive=2, # This is max_count
             max_log_age_days=3             # This is max_age_days
         )
+        log_manager._cleanup_thread.join(timeout=5) # Let the startup cleanup finish before creating the test files
 
         log_files_data = {
             "prefix_2023-01-09_10-00-00.log": (now_for_test - timedelta(days=1)),
@@ -230,6 +263,25 @@ class TestLogManager(unittest.TestCase):
         
         self.assertSetEqual(called_unlink_on_paths, expected_deleted_paths)
 
+    @patch('comfy_launcher.log_manager.LogManager._perform_log_rotation_and_cleanup')
+    def test_scan_archived_logs_groups_by_base_name_in_one_pass(self, mock_perform_rotation):
+        log_manager = LogManager(
+            log_dir=self.log_dir, debug_mode=False,
+            max_files_to_keep_in_archive=3, max_log_age_days=5
+        )
+        log_manager.shutdown()
+        for name, mtime in (("launcher_old.log", 100), ("launcher_new.log", 200), ("server_a.log", 150), ("notes.txt", 150)):
+            (self.archive_dir / name).write_text("x")
+            os.utime(self.archive_dir / name, (mtime, mtime))
+        (self.archive_dir / "server_dir.log").mkdir() # Directories are never candidates
+
+        with patch('comfy_launcher.log_manager.os.scandir', wraps=os.scandir) as mock_scandir:
+            archived = log_manager._scan_archived_logs(("launcher", "server"))
+
+        mock_scandir.assert_called_once_with(self.archive_dir)
+        self.assertEqual(archived["launcher"], [(200, self.archive_dir / "launcher_new.log"), (100, self.archive_dir / "launcher_old.log")])
+        self.assertEqual(archived["server"], [(150, self.archive_dir / "server_a.log")])
+
     @patch('comfy_launcher.log_manager.LogManager._rotate_log_file')
     @patch('comfy_launcher.log_manager.LogManager._cleanup_archived_logs')
     def test_perform_log_rotation_and_cleanup_orchestration(self, mock_cleanup_archived, mock_rotate_file):
@@ -250,14 +302,16 @@ class TestLogManager(unittest.TestCase):
         # So we check if these mocks (now methods of LogManager) were called correctly.
         # The logger passed to them will be the instance's logger.
         logger_arg = log_manager.get_launcher_logger()
+        self.assertEqual(log_manager._cleanup_thread.name, "LogArchiveCleanup") # Archive pruning runs off the startup path
+        log_manager._cleanup_thread.join(timeout=5)
         mock_rotate_file.assert_has_calls([
             call("launcher.log", logger_arg),
             call("server.log", logger_arg)
         ], any_order=True) 
         
         mock_cleanup_archived.assert_has_calls([
-            call("launcher", logger_arg),
-            call("server", logger_arg)
+            call("launcher", logger_arg, []), # Both lists come from a single scan of the (empty) archive
+            call("server", logger_arg, [])
         ], any_order=True)
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@ from pathlib import Path
 import threading as python_threading # Alias for actual threading module to avoid patch conflicts
 import logging
 import subprocess # For spec in app_logic_thread_func test
+import os
 
 import sys
 project_root = Path(__file__).resolve().parent.parent
@@ -189,24 +190,18 @@ class TestMainExecution(unittest.TestCase):
         mock_server_manager.start_server.return_value = mock_server_process_obj
         
         _wait_call_count = 0
-        def shutdown_wait_side_effect(timeout):
+        def shutdown_wait_side_effect(timeout=None):
             nonlocal _wait_call_count
             _wait_call_count += 1
-            if _wait_call_count == 1:
-                self.assertEqual(timeout, 0.5, "First wait call should be 0.5s")
-                return False
-            elif _wait_call_count == 2:
-                self.assertEqual(timeout, 0.5, "Second wait call should be 0.5s")
-                return False
-            elif _wait_call_count == 3:
-                self.assertEqual(timeout, 1, "Third wait call should be 1s timeout")
+            if _wait_call_count == 1: # No pacing waits; once ready, the monitor blocks without a timeout
+                self.assertIsNone(timeout, "Monitor should block on the shutdown event once the server is ready")
                 return True
             raise AssertionError(f"Unexpected call to shutdown_event.wait with timeout={timeout} at call_count={_wait_call_count}")
         mock_shutdown_event.wait.side_effect = shutdown_wait_side_effect
 
         with patch('comfy_launcher.__main__.settings') as mock_main_settings, \
              patch('comfy_launcher.__main__.event_publisher', mock_event_publisher), \
-             patch('comfy_launcher.__main__.threading.Event', MagicMock(return_value=_gui_initial_content_loaded_event_for_test)):
+             patch('comfy_launcher.__main__._gui_content_loaded_event', _gui_initial_content_loaded_event_for_test):
             
             mock_main_settings.PORT = 8188
             _gui_initial_content_loaded_event_for_test.set()
@@ -220,39 +215,32 @@ class TestMainExecution(unittest.TestCase):
         mock_app_logger.info.assert_any_call("GUI content loaded. Proceeding with server launch sequence.")
 
         mock_gui_manager.set_status.assert_any_call("Initializing...")
-        mock_shutdown_event.wait.assert_any_call(0.5)
 
         mock_gui_manager.set_status.assert_any_call(f"Clearing network port {mock_main_settings.PORT}...")
         mock_server_manager.kill_process_on_port.assert_called_once()
         mock_gui_manager.set_status.assert_any_call("Starting ComfyUI server process...")
         mock_server_manager.start_server.assert_called_once_with(mock_server_log_path)
 
-        if mock_threading_Thread_p.called:
-            mock_redirect_stop_event_arg = mock_threading_Thread_p.call_args[1]['args'][0]
-            self.assertIsInstance(mock_redirect_stop_event_arg, python_threading.Event)
-
-            mock_threading_Thread_p.assert_called_once_with(
-                target=mock_gui_manager.redirect_when_ready_loop,
-                args=(mock_redirect_stop_event_arg, mock_shutdown_event),
-                daemon=True
-            )
-            mock_threading_Thread_p.return_value.start.assert_called_once()
-        else:
-            self.fail("threading.Thread for redirect_when_ready_loop was not called.")
-        mock_app_logger.info.assert_any_call("Redirection loop initiated.")
+        # Readiness is probed from the monitor loop and delivered as SERVER_READY; no redirect thread is started.
+        # Without a pidfd (a plain Event here), the only thread is the one blocking on the server process.
+        mock_threading_Thread_p.assert_called_once_with(
+            target=launcher_main_module._report_server_exit,
+            args=(mock_app_logger, mock_server_process_obj, mock_shutdown_event),
+            name="ServerExitWatcher", daemon=True)
+        mock_gui_manager.start_server_ready_deadline.assert_called_once()
 
         mock_app_logger.info.assert_any_call("Now monitoring server process and shutdown event.")
         mock_server_process_obj.poll.assert_called()
-        mock_shutdown_event.wait.assert_any_call(timeout=1)
+        mock_server_manager.check_server_ready.assert_called_once_with(wake_event=mock_shutdown_event)
+        mock_shutdown_event.wait.assert_called_once_with()
 
         mock_app_logger.info.assert_any_call("Cleaning up...")
-        self.assertTrue(mock_redirect_stop_event_arg.is_set())
         mock_server_manager.shutdown_server.assert_called_once()
 
     @patch('comfy_launcher.__main__.time.sleep', return_value=None)
     @patch('comfy_launcher.__main__.app_shutdown_event', new_callable=lambda: MagicMock(spec=TestMainExecution.OriginalEventClass))
-    @patch('comfy_launcher.__main__.threading.Event')
-    def test_app_logic_thread_func_gui_timeout(self, mock_sut_event_constructor,
+    @patch('comfy_launcher.__main__._gui_content_loaded_event')
+    def test_app_logic_thread_func_gui_timeout(self, mock_gui_content_loaded_event,
                                                mock_global_app_shutdown_event,
                                                mock_time_sleep,
                                                MockTrayManager_class_level_param):
@@ -263,9 +251,7 @@ class TestMainExecution(unittest.TestCase):
         mock_shutdown_event = mock_global_app_shutdown_event
 
         mock_event_publisher = MagicMock()
-        mock_gui_load_event_instance_for_timeout = MagicMock(spec=self.OriginalEventClass, name="MockGuiLoadEventForTimeout")
-        mock_gui_load_event_instance_for_timeout.wait.return_value = False
-        mock_sut_event_constructor.return_value = mock_gui_load_event_instance_for_timeout
+        mock_gui_content_loaded_event.wait.return_value = False # The module-level content-loaded event never fires
 
         mock_gui_manager.webview_window = MagicMock()
         mock_shutdown_event.is_set.return_value = False
@@ -280,13 +266,14 @@ class TestMainExecution(unittest.TestCase):
             message="GUI did not load correctly. Check launcher logs."
         )
         mock_gui_manager.load_critical_error_page.assert_not_called()
-        mock_server_manager.kill_process_on_port.assert_not_called()
+        mock_server_manager.kill_process_on_port.assert_called_once() # Runs while the window is still loading
+        mock_server_manager.start_server.assert_not_called()
 
     @patch('comfy_launcher.__main__.time.sleep', return_value=None)
     @patch('comfy_launcher.__main__.threading.Thread')
     @patch('comfy_launcher.__main__.app_shutdown_event', new_callable=lambda: MagicMock(spec=TestMainExecution.OriginalEventClass))
-    @patch('comfy_launcher.__main__.threading.Event')
-    def test_app_logic_thread_func_server_start_fails(self, mock_sut_event_constructor,
+    @patch('comfy_launcher.__main__._gui_content_loaded_event')
+    def test_app_logic_thread_func_server_start_fails(self, mock_gui_content_loaded_event,
                                                       mock_global_app_shutdown_event,
                                                       mock_sut_thread_constructor,
                                                       mock_time_sleep,
@@ -298,9 +285,7 @@ class TestMainExecution(unittest.TestCase):
         mock_shutdown_event = mock_global_app_shutdown_event
 
         mock_event_publisher = MagicMock()
-        mock_gui_load_event_instance_for_success = MagicMock(spec=self.OriginalEventClass, name="MockGuiLoadEventForSuccess")
-        mock_gui_load_event_instance_for_success.wait.return_value = True
-        mock_sut_event_constructor.return_value = mock_gui_load_event_instance_for_success
+        mock_gui_content_loaded_event.wait.return_value = True
 
         mock_server_manager.start_server.return_value = None
         mock_gui_manager.webview_window = MagicMock()
@@ -327,6 +312,78 @@ class TestMainExecution(unittest.TestCase):
         mock_gui_manager.load_error_page.assert_not_called()
         mock_sut_thread_constructor.assert_not_called()
 
+class TestServerExitMonitoring(unittest.TestCase):
+
+    def test_monitor_probes_with_growing_interval_until_ready(self):
+        mock_server_manager = MagicMock(spec=ServerManager)
+        mock_process = MagicMock(spec=subprocess.Popen, pid=12345)
+        mock_process.poll.return_value = None
+        mock_server_manager.start_server.return_value = mock_process
+        mock_server_manager.check_server_ready.side_effect = [False, False, False, True]
+        shutdown_event = MagicMock(spec=python_threading.Event)
+        shutdown_event.is_set.return_value = False
+        shutdown_event.wait.side_effect = lambda timeout=None: timeout is None # Timed waits elapse; the final blocking wait ends the loop
+        content_loaded_event = python_threading.Event()
+        content_loaded_event.set()
+
+        with patch('comfy_launcher.__main__.settings'), \
+             patch('comfy_launcher.__main__.event_publisher'), \
+             patch('comfy_launcher.__main__._gui_content_loaded_event', content_loaded_event), \
+             patch('comfy_launcher.__main__.threading.Thread'):
+            app_logic_thread_func(MagicMock(spec=logging.Logger), MagicMock(spec=GUIManager), mock_server_manager,
+                                  Path("/fake/logs/server.log"), shutdown_event)
+
+        self.assertEqual(shutdown_event.wait.call_args_list, [call(timeout=0.1), call(timeout=0.2), call(timeout=0.4), call()])
+
+    def test_report_server_exit_publishes_unexpected_stop(self):
+        mock_app_logger = MagicMock(spec=logging.Logger)
+        mock_process = MagicMock(spec=subprocess.Popen, pid=12345)
+        mock_process.wait.return_value = 3
+        shutdown_event = python_threading.Event()
+        with patch('comfy_launcher.__main__.event_publisher') as mock_event_publisher:
+            launcher_main_module._report_server_exit(mock_app_logger, mock_process, shutdown_event)
+            shutdown_event_already_set = python_threading.Event()
+            shutdown_event_already_set.set() # A requested shutdown is not reported as unexpected
+            launcher_main_module._report_server_exit(mock_app_logger, mock_process, shutdown_event_already_set)
+        mock_event_publisher.publish.assert_called_once_with(
+            launcher_main_module.AppEventType.SERVER_STOPPED_UNEXPECTEDLY, pid=12345, returncode=3)
+        self.assertTrue(shutdown_event.is_set())
+
+    @unittest.skipUnless(hasattr(os, "pidfd_open"), "pidfd_open is Linux-only")
+    def test_wakes_on_process_exit_and_on_shutdown(self):
+        shutdown_event = launcher_main_module._SelectableEvent()
+        exiting_process = subprocess.Popen([sys.executable, "-c", "pass"])
+        self.assertTrue(launcher_main_module._block_until_exit_or_shutdown(exiting_process, shutdown_event))
+        self.assertIsNotNone(exiting_process.wait(timeout=5))
+
+        running_process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            python_threading.Timer(0.05, shutdown_event.set).start()
+            self.assertTrue(launcher_main_module._block_until_exit_or_shutdown(running_process, shutdown_event))
+            self.assertIsNone(running_process.poll()) # Woken by the event, not the process
+        finally:
+            running_process.kill()
+            running_process.wait()
+
+        shutdown_event.clear()
+        self.assertFalse(shutdown_event.is_set())
+
+    @unittest.skipUnless(hasattr(os, "pidfd_open"), "pidfd_open is Linux-only")
+    def test_selectable_event_opens_pipe_on_first_fileno(self):
+        shutdown_event = launcher_main_module._SelectableEvent()
+        self.assertIsNone(shutdown_event._read_fd) # Nothing is opened until someone selects on it
+        shutdown_event.set()
+        read_fd = shutdown_event.fileno()
+        try:
+            self.assertEqual(os.read(read_fd, 1), b"\0") # Set before the pipe existed, yet it reads as ready
+        finally:
+            os.close(read_fd)
+            os.close(shutdown_event._write_fd)
+
+    def test_plain_event_falls_back_to_polling(self):
+        mock_process = MagicMock(spec=subprocess.Popen, pid=12345)
+        self.assertFalse(launcher_main_module._block_until_exit_or_shutdown(mock_process, python_threading.Event()))
+
 class TestMainEventHandlers(unittest.TestCase):
 
     def setUp(self):
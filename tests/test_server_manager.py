@@ -8,6 +8,8 @@ import platform # For platform-specific logic
 import signal # For signal constants like SIGTERM
 import os # For os.kill, os.killpg, os.getpgid
 import psutil # For psutil.Process spec
+import tempfile
+import socket
 
 # Add project root to sys.path for imports from 'launcher'
 import sys
@@ -15,12 +17,17 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from comfy_launcher.server_manager import ServerManager
+from comfy_launcher import server_manager as server_manager_module
+from comfy_launcher.server_manager import ServerManager, _collect_inet_diag_listeners
+import struct
+from comfy_launcher.event_system import AppEventType
 # from comfy_launcher.config import Settings # Not directly used in this test file anymore
 
 # Suppress logging output during tests unless specifically needed
 # logging.disable(logging.CRITICAL)
 
+server_manager_module._psutil_module() # psutil is imported lazily; load it so tests can patch its attributes
+
 class TestServerManager(unittest.TestCase):
 
     def setUp(self):
@@ -95,9 +102,10 @@ class TestServerManager(unittest.TestCase):
             cwd=str(self.mock_comfyui_path), # Expect string for cwd
             stdout=mock_file_open.return_value,
             stderr=subprocess.STDOUT,
-            creationflags=expected_creationflags
+            creationflags=expected_creationflags,
+            start_new_session=platform.system() != "Windows"
         )
-        mock_file_open.assert_called_with(server_log_path, "w", encoding="utf-8")
+        mock_file_open.assert_called_with(server_log_path, "wb", buffering=0)
         self.assertEqual(process, mock_process_instance)
         self.assertEqual(self.server_manager.server_process, mock_process_instance)
         self.mock_logger.info.assert_any_call(f"ComfyUI server process started with PID: 12345")
@@ -155,30 +163,76 @@ class TestServerManager(unittest.TestCase):
             exc_info=True
         )
 
-    @patch('comfy_launcher.server_manager.socket.create_connection')
-    @patch('comfy_launcher.server_manager.time.sleep', return_value=None)
-    def test_wait_for_server_availability_success(self, mock_sleep, mock_create_connection):
-        mock_create_connection.side_effect = [
-            OSError("Connection refused"), OSError("Connection refused"), MagicMock()
-        ]
-        result = self.server_manager.wait_for_server_availability(retries=5, delay=0.01)
-        self.assertTrue(result)
-        self.assertEqual(mock_create_connection.call_count, 3)
-        self.mock_logger.info.assert_any_call("✅ Server is available! (Attempt 3)")
-
-    @patch('comfy_launcher.server_manager.socket.create_connection')
-    @patch('comfy_launcher.server_manager.time.sleep', return_value=None)
-    def test_wait_for_server_availability_failure_timeout(self, mock_sleep, mock_create_connection):
-        mock_create_connection.side_effect = OSError("Connection refused")
-        test_retries = 3
-        test_delay = 0.01
-        result = self.server_manager.wait_for_server_availability(retries=test_retries, delay=test_delay)
-        self.assertFalse(result)
-        self.assertEqual(mock_create_connection.call_count, test_retries)
-        expected_seconds_str = f"{test_retries * test_delay:.0f}" # Format to 0 decimal places
-        self.mock_logger.error.assert_any_call(
-            f"Server at {self.test_host}:{self.test_port} did not become available after {expected_seconds_str} seconds."
-        )
+    @patch('comfy_launcher.server_manager.event_publisher')
+    @patch.object(ServerManager, '_probe_connection')
+    def test_check_server_ready_publishes_once(self, mock_probe_connection, mock_event_publisher):
+        mock_probe_connection.side_effect = [OSError("Connection refused"), None]
+
+        self.assertFalse(self.server_manager.check_server_ready())
+        mock_event_publisher.publish.assert_not_called()
+
+        self.assertTrue(self.server_manager.check_server_ready())
+        self.assertTrue(self.server_manager.check_server_ready()) # Already known ready: no further probe or event
+        self.assertEqual(mock_probe_connection.call_count, 2)
+        mock_probe_connection.assert_called_with(timeout=1, wake_event=None)
+        mock_event_publisher.publish.assert_called_once_with(AppEventType.SERVER_READY)
+
+    @patch.object(ServerManager, '_probe_connection', side_effect=InterruptedError("Connection attempt abandoned: shutdown requested"))
+    def test_check_server_ready_abandoned_by_wake_event(self, mock_probe_connection):
+        wake_event = MagicMock()
+        self.assertFalse(self.server_manager.check_server_ready(wake_event=wake_event))
+        mock_probe_connection.assert_called_once_with(timeout=1, wake_event=wake_event)
+        self.assertFalse(self.server_manager.server_ready)
+
+    def test_probe_connection_against_real_listener(self):
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen()
+            self.server_manager.port = listener.getsockname()[1]
+            with patch('comfy_launcher.server_manager.socket.getaddrinfo', wraps=socket.getaddrinfo) as mock_getaddrinfo:
+                self.server_manager._probe_connection(timeout=1) # Accepted: no exception
+                self.server_manager._probe_connection(timeout=1)
+            mock_getaddrinfo.assert_called_once() # connect_host is resolved on the first probe only
+        with self.assertRaises(OSError): # Listener closed: refused
+            self.server_manager._probe_connection(timeout=1)
+
+    def test_probe_connection_falls_back_to_next_address(self):
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            refused_address = closed.getsockname()
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen()
+            # As when "localhost" resolves to an address the server is not listening on before the one it is
+            self.server_manager._connect_addrinfo = [
+                (socket.AF_INET, socket.SOCK_STREAM, 0, "", refused_address),
+                (socket.AF_INET, socket.SOCK_STREAM, 0, "", listener.getsockname()),
+            ]
+            self.server_manager._probe_connection(timeout=1) # Refused on the first address, accepted on the second
+
+        self.server_manager._connect_addrinfo = self.server_manager._connect_addrinfo[:1]
+        with self.assertRaises(ConnectionRefusedError): # With every address refused, the last error is raised
+            self.server_manager._probe_connection(timeout=1)
+
+    def test_probe_connection_ends_early_when_wake_event_is_set(self):
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        os.write(write_fd, b"\0")
+        wake_event = MagicMock(spec=["fileno", "is_set"]) # Stands in for the launcher's selectable shutdown event
+        wake_event.fileno.return_value = read_fd
+        wake_event.is_set.return_value = True
+        # A connect to a non-routable address stays in progress, so only the wake event can end the wait early
+        self.server_manager._connect_addrinfo = [(socket.AF_INET, socket.SOCK_STREAM, 0, "", ("10.255.255.1", 9))]
+        start = time.monotonic()
+        try:
+            self.server_manager._probe_connection(timeout=5, wake_event=wake_event)
+            self.fail("Probe should not succeed against a non-routable address")
+        except InterruptedError:
+            pass
+        except OSError as e: # e.g. ENETUNREACH on a host without a default route
+            self.skipTest(f"Connect did not stay in progress here: {e}")
+        self.assertLess(time.monotonic() - start, 2)
 
     @patch('comfy_launcher.server_manager.os.kill')
     @patch('comfy_launcher.server_manager.platform.system', return_value="Windows")
@@ -197,13 +251,13 @@ class TestServerManager(unittest.TestCase):
         self.server_manager.shutdown_server() # No argument passed
 
         mock_os_kill.assert_called_once_with(mock_process.pid, mock_signal_sut.CTRL_BREAK_EVENT)
-        mock_process.wait.assert_called_once_with(timeout=10)
+        mock_process.wait.assert_called_once_with(timeout=ServerManager.SHUTDOWN_GRACE_PERIOD)
         self.mock_logger.info.assert_any_call(f"Server process {mock_process.pid} exited gracefully.")
         mock_process.kill.assert_not_called()
         self.assertIsNone(self.server_manager.server_process)
 
     @patch('comfy_launcher.server_manager.os.killpg')
-    @patch('comfy_launcher.server_manager.os.getpgid', return_value=54321)
+    @patch('comfy_launcher.server_manager.os.getpgid')
     @patch('comfy_launcher.server_manager.platform.system', return_value="Linux")
     # No need to patch comfy_launcher.server_manager.signal here as SIGTERM is standard
     def test_shutdown_server_graceful_linux(self, mock_platform_system, mock_os_getpgid, mock_os_killpg):
@@ -215,9 +269,9 @@ class TestServerManager(unittest.TestCase):
         
         self.server_manager.shutdown_server() # No argument passed
 
-        mock_os_getpgid.assert_called_once_with(mock_process.pid)
-        mock_os_killpg.assert_called_once_with(54321, signal.SIGTERM) # SUT uses signal.SIGTERM directly
-        mock_process.wait.assert_called_once_with(timeout=10)
+        mock_os_getpgid.assert_not_called() # The server is its own session leader, so pgid == pid
+        mock_os_killpg.assert_called_once_with(mock_process.pid, signal.SIGTERM) # SUT uses signal.SIGTERM directly
+        mock_process.wait.assert_called_once_with(timeout=ServerManager.SHUTDOWN_GRACE_PERIOD)
         self.mock_logger.info.assert_any_call(f"Server process {mock_process.pid} exited gracefully.")
         mock_process.kill.assert_not_called()
         self.assertIsNone(self.server_manager.server_process)
@@ -238,8 +292,8 @@ class TestServerManager(unittest.TestCase):
         mock_process = MagicMock(spec=subprocess.Popen)
         mock_process.pid = 12345
         mock_process.poll.return_value = None
-        mock_process.wait.side_effect = [
-            subprocess.TimeoutExpired(cmd="fake_cmd", timeout=10), None
+        mock_process.wait.side_effect = [ # Ignores the first and the repeated stop signal, then dies on kill()
+            subprocess.TimeoutExpired(cmd="fake_cmd", timeout=2), subprocess.TimeoutExpired(cmd="fake_cmd", timeout=3), None
         ]
         self.server_manager.server_process = mock_process
         
@@ -248,20 +302,24 @@ class TestServerManager(unittest.TestCase):
         if mock_platform_system.return_value == "Windows":
             mock_os_kill_direct.assert_any_call(mock_process.pid, mock_signal_sut.CTRL_BREAK_EVENT)
         else: # Assuming Linux or other POSIX
-            mock_os_getpgid.assert_called_with(mock_process.pid)
-            mock_os_killpg.assert_called_with(mock_os_getpgid.return_value, mock_signal_sut.SIGTERM)
+            mock_os_getpgid.assert_not_called()
+            self.assertEqual(mock_os_killpg.call_count, 2) # Stop signal sent, then repeated once
+            mock_os_killpg.assert_called_with(mock_process.pid, mock_signal_sut.SIGTERM)
         
-        mock_process.wait.assert_any_call(timeout=10)
-        self.mock_logger.warning.assert_any_call(f"Server process {mock_process.pid} did not respond to graceful shutdown signal after 10s. Forcing termination (kill)...")
+        mock_process.wait.assert_any_call(timeout=ServerManager.SHUTDOWN_GRACE_PERIOD)
+        mock_process.wait.assert_any_call(timeout=ServerManager.SHUTDOWN_SECOND_SIGNAL_PERIOD)
+        self.mock_logger.warning.assert_any_call(f"Server process {mock_process.pid} did not respond to graceful shutdown signals after 5s. Forcing termination (kill)...")
         mock_process.kill.assert_called_once()
-        mock_process.wait.assert_called_with(timeout=5)
-        self.assertGreaterEqual(mock_process.wait.call_count, 2)
+        mock_process.wait.assert_called_with(timeout=ServerManager.SHUTDOWN_KILL_WAIT)
+        self.assertEqual(mock_process.wait.call_count, 3)
         self.mock_logger.info.assert_any_call(f"Server process {mock_process.pid} force-killed.")
         self.assertIsNone(self.server_manager.server_process)
 
+    @patch('comfy_launcher.server_manager.platform.system', return_value="Darwin") # Exercise the psutil path
     @patch('comfy_launcher.server_manager.psutil.Process')
     @patch('comfy_launcher.server_manager.psutil.net_connections')
-    def test_kill_process_on_port_found_and_killed(self, mock_net_connections, mock_psutil_process_class):
+    @patch.object(ServerManager, '_port_is_free', return_value=False) # Force the enumeration path
+    def test_kill_process_on_port_found_and_killed(self, mock_port_is_free, mock_net_connections, mock_psutil_process_class, mock_platform_system):
         mock_conn = MagicMock()
         mock_conn.laddr.port = self.test_port
         mock_conn.status = 'LISTEN'
@@ -275,13 +333,16 @@ class TestServerManager(unittest.TestCase):
 
         self.server_manager.kill_process_on_port()
 
+        mock_net_connections.assert_called_once_with(kind='tcp')
         mock_psutil_process_class.assert_called_once_with(6789)
         mock_proc_instance.kill.assert_called_once()
         mock_proc_instance.wait.assert_called_once_with(timeout=5)
         self.mock_logger.info.assert_any_call(f"✅ PID {mock_proc_instance.pid} terminated.")
 
+    @patch('comfy_launcher.server_manager.platform.system', return_value="Darwin")
     @patch('comfy_launcher.server_manager.psutil.net_connections')
-    def test_kill_process_on_port_not_found(self, mock_net_connections):
+    @patch.object(ServerManager, '_port_is_free', return_value=False) # Force the enumeration path
+    def test_kill_process_on_port_not_found(self, mock_port_is_free, mock_net_connections, mock_platform_system):
         """Test when no process is found on the port."""
         mock_net_connections.return_value = []
         self.server_manager.kill_process_on_port()
@@ -297,5 +358,66 @@ class TestServerManager(unittest.TestCase):
                 break
         self.assertFalse(found_old_message, "Old log message should not be present.")
 
+    @patch('comfy_launcher.server_manager.platform.system', return_value="Linux")
+    @patch('comfy_launcher.server_manager.psutil.Process')
+    @patch('comfy_launcher.server_manager.psutil.net_connections')
+    @patch.object(ServerManager, '_port_is_free', return_value=False) # Force the enumeration path
+    def test_kill_process_on_port_reads_procfs_on_linux(self, mock_port_is_free, mock_net_connections, mock_psutil_process_class, mock_platform_system):
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        tcp_rows = [
+            # Same port but ESTABLISHED (st 01), then a different listening port, then the listener we want
+            "   0: 0100007F:1FFC 0100007F:A2B4 01 00000000:00000000 00:00000000 00000000  1000        0 1111 1\n",
+            "   1: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 2222 1\n",
+            "   2: 0100007F:1FFC 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 3333 1\n",
+        ]
+        with tempfile.TemporaryDirectory() as proc_root:
+            os.makedirs(os.path.join(proc_root, "net"))
+            with open(os.path.join(proc_root, "net", "tcp"), "w") as f: f.write(header + "".join(tcp_rows))
+            for pid, inode in (("100", "2222"), ("200", "3333")):
+                os.makedirs(os.path.join(proc_root, pid, "fd"))
+                os.symlink(f"socket:[{inode}]", os.path.join(proc_root, pid, "fd", "3"))
+            mock_proc_instance = MagicMock()
+            mock_proc_instance.pid = 200
+            mock_psutil_process_class.return_value = mock_proc_instance
+
+            with patch('comfy_launcher.server_manager.PROC_ROOT', Path(proc_root)), \
+                 patch('comfy_launcher.server_manager._listening_socket_inodes_netlink', side_effect=PermissionError(1, "denied")):
+                self.server_manager.kill_process_on_port() # netlink refused, so the /proc/net/tcp fallback is used
+
+        mock_net_connections.assert_not_called() # No full connection-table enumeration on Linux
+        mock_psutil_process_class.assert_called_once_with(200)
+        mock_proc_instance.kill.assert_called_once()
+
+    def test_server_manager_import_does_not_import_psutil(self):
+        probe = "import sys, comfy_launcher.server_manager; print('psutil' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+                                env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+        self.assertEqual(result.stdout.strip(), "False")
+
+    @patch('comfy_launcher.server_manager.psutil.net_connections')
+    def test_kill_process_on_port_skips_enumeration_when_port_is_free(self, mock_net_connections):
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            self.server_manager.port = listener.getsockname()[1]
+            listener.listen()
+            self.assertFalse(self.server_manager._port_is_free())
+        self.assertTrue(self.server_manager._port_is_free()) # Listener closed, so the port binds again
+
+        with patch.object(ServerManager, '_find_pid_listening_on_port') as mock_find_pid:
+            self.server_manager.kill_process_on_port()
+        mock_find_pid.assert_not_called()
+        mock_net_connections.assert_not_called()
+
+    def test_collect_inet_diag_listeners_parses_netlink_records(self):
+        def diag_msg(state, sport, inode):
+            body = struct.pack("=BBBB", socket.AF_INET, state, 0, 0) + struct.pack("!HH", sport, 0) + bytes(44)
+            body += struct.pack("=IIIII", 0, 0, 0, 1000, inode)
+            return struct.pack("=IHHII", 16 + len(body), 20, 2, 0, 0) + body
+        inodes = set()
+        datagram = diag_msg(10, self.test_port, 3333) + diag_msg(1, self.test_port, 1111) + diag_msg(10, 22, 2222)
+        self.assertFalse(_collect_inet_diag_listeners(datagram, self.test_port, inodes))
+        self.assertEqual(inodes, {3333}) # Only the LISTEN record for our port
+        self.assertTrue(_collect_inet_diag_listeners(struct.pack("=IHHIIi", 20, 3, 2, 0, 0, 0), self.test_port, inodes))
+
 if __name__ == '__main__':
     unittest.main()